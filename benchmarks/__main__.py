@@ -0,0 +1,50 @@
+import argparse
+import json
+import sys
+
+from .suite import STAGES, find_regressions, run_suite
+
+
+def parse_args(argv: list) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks', description='Benchmark jpprint stage by stage.'
+    )
+    parser.add_argument('cases', nargs='*', help='Cases to run (default: all)')
+    parser.add_argument('--compare', help='Baseline results JSON to check for regressions')
+    parser.add_argument('--output', help='Write results JSON to this path')
+    parser.add_argument('--repeats', default=3, type=int, help='Timing runs per case; the fastest is kept')
+    parser.add_argument('--scale', default=1, type=int, help='Multiply document sizes')
+    parser.add_argument('--threshold', default=0.25, type=float, help='Allowed slowdown/growth ratio')
+    return parser.parse_args(argv)
+
+
+def print_table(results: dict):
+    print(f'{"case":<18}{"lines":>9}' + ''.join(f'{stage:>19}' for stage in STAGES))
+    for case, result in results['cases'].items():
+        cells = ''.join(
+            f'{stats["seconds"] * 1000:>9.1f}ms {stats["peak_bytes"] / 1e6:>5.1f}MB'
+            for stats in result['stages'].values()
+        )
+        print(f'{case:<18}{result["lines"]:>9}{cells}')
+    for name, seconds in results['imports'].items():
+        print(f'import {name:<11}{seconds * 1000:>9.1f}ms')
+
+
+def main(argv: list) -> int:
+    args = parse_args(argv)
+    results = run_suite(args.cases, repeats=args.repeats, scale=args.scale)
+    print_table(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding='utf-8') as handle:
+        regressions = find_regressions(json.load(handle), results, args.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
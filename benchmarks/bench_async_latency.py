@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Measure how long a large diff blocks the asyncio event loop.
+
+A heartbeat task sleeps for 1ms in a loop and records how late each wake-up is.
+The worst delay while the diff runs is the event-loop blocking time.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from jpprint import adiff, jpprint
+
+HEARTBEAT = 0.001
+
+
+def make_documents(size: int) -> tuple[dict, dict]:
+    left = {f'key{n:07}': {'value': n, 'tags': ['a', 'b']} for n in range(size)}
+    right = {
+        key: {'value': value['value'] + (key.endswith('7')), 'tags': value['tags']}
+        for key, value in left.items()
+    }
+    return left, right
+
+
+async def heartbeat(delays: list, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT)
+        delays.append(time.perf_counter() - start - HEARTBEAT)
+
+
+async def measure(name: str, work) -> None:
+    delays = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(delays, stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    print(f'{name:<24} total {elapsed * 1000:8.1f}ms   max loop block {max(delays, default=0) * 1000:8.1f}ms')
+
+
+async def main(size: int, chunk_size: int):
+    left, right = make_documents(size)
+
+    async def blocking():
+        jpprint(left, right, retr=True, use_colors=False)
+
+    async def chunked():
+        await adiff(left, right, chunk_size=chunk_size, use_colors=False)
+
+    await measure('jpprint (blocking)', blocking)
+    await measure(f'adiff (chunk={chunk_size})', chunked)
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    asyncio.run(main(size, chunk_size))
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+"""
+Measure HTML render throughput and report size for a large, mostly-equal diff.
+
+Run with an optional line count: python benchmarks/bench_html.py 1000000
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from jpprint import html_diff
+
+
+def make_documents(size: int) -> tuple[list, list]:
+    left = list(range(size))
+    right = list(left)
+    for index in range(0, size, max(size // 10, 1)):
+        right[index] = -index
+    return left, right
+
+
+def measure(name: str, left: list, right: list, **options) -> None:
+    start = time.perf_counter()
+    size = sum(len(chunk.encode()) for chunk in html_diff(left, right, **options))
+    elapsed = time.perf_counter() - start
+    lines = len(left) + 2
+    print(
+        f'{name:<22} {elapsed * 1000:9.1f}ms  {lines / elapsed:12,.0f} lines/s  '
+        f'{size / elapsed / 1e6:7.1f} MB/s  {size / 1e6:9.2f} MB'
+    )
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    left, right = make_documents(size)
+    measure('expanded', left, right, collapse_after=size + 10)
+    measure('collapsed (template)', left, right)
+    measure('collapsed (dropped)', left, right, keep_collapsed=False)
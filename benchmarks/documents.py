@@ -0,0 +1,49 @@
+import copy
+
+
+def wide_object(size: int) -> dict:
+    return {f'field{n:06}': f'value {n}' for n in range(size)}
+
+
+def deep_nesting(depth: int) -> dict:
+    document = {'leaf': 'bottom'}
+    for level in range(depth):
+        document = {'child': document, 'level': level, 'name': f'node {level}'}
+    return document
+
+
+def huge_array(size: int) -> list:
+    return [{'id': n, 'name': f'item {n}', 'tags': ['alpha', 'beta']} for n in range(size)]
+
+
+def mutate_every(document, step: int):
+    changed = copy.deepcopy(document)
+    if isinstance(changed, dict):
+        for key in list(changed)[::step]:
+            changed[key] = 'changed'
+    else:
+        for index in range(0, len(changed), step):
+            changed[index] = 'changed'
+    return changed
+
+
+def mutate_leaf(document: dict) -> dict:
+    changed = copy.deepcopy(document)
+    node = changed
+    while 'child' in node:
+        node = node['child']
+    node['leaf'] = 'changed'
+    return changed
+
+
+def case_pairs(scale: int) -> dict:
+    wide = wide_object(2000 * scale)
+    array = huge_array(1000 * scale)
+    deep = deep_nesting(50 * scale)
+    return {
+        'deep_nesting': (deep, mutate_leaf(deep)),
+        'fully_different': (wide_object(200 * scale), huge_array(100 * scale)),
+        'huge_array': (array, mutate_every(array, 10)),
+        'mostly_equal': (wide, mutate_every(wide, 500)),
+        'wide_object': (wide, mutate_every(wide, 10)),
+    }
@@ -0,0 +1,184 @@
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from jpprint.core import DEFAULTS, format_lines
+from jpprint.output import aligned_rows, format_rows, output_params
+from jpprint.sinks import StreamSink, emit_lines
+
+from .documents import case_pairs
+
+# Absolute slack so sub-millisecond noise on tiny stages never counts as a regression
+MIN_SECONDS_DELTA = 0.002
+MIN_BYTES_DELTA = 64 * 1024
+MIN_BLOCKS_DELTA = 1000
+
+
+def stage_format(state: dict):
+    state['f1'], state['f2'] = format_lines(state['left'], state['right'], {})
+
+
+def stage_width(state: dict):
+    state['widths'] = state['f1'].width, state['f2'].width
+
+
+def stage_align(state: dict):
+    state['rows'] = list(aligned_rows(state['f1'].lines, state['f2'].lines))
+
+
+def stage_render(state: dict):
+    params = output_params('<>', *state['widths'], '|', False, True, True)
+    state['output'] = list(format_rows(state['rows'], params, False))
+
+
+def stage_print(state: dict):
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        emit_lines(state['output'], StreamSink(devnull), DEFAULTS['chunk_size'])
+
+
+STAGES = {
+    'format': stage_format,
+    'width': stage_width,
+    'align': stage_align,
+    'render': stage_render,
+    'print': stage_print,
+}
+
+
+def time_stages(left, right) -> dict:
+    state = {'left': left, 'right': right}
+    timings = {}
+    for name, stage in STAGES.items():
+        start = time.perf_counter()
+        stage(state)
+        timings[name] = time.perf_counter() - start
+    timings['lines'] = len(state['rows'])
+    return timings
+
+
+def memory_by_stage(left, right) -> dict:
+    state = {'left': left, 'right': right}
+    memory = {}
+    tracemalloc.start()
+    try:
+        for name, stage in STAGES.items():
+            baseline = tracemalloc.get_traced_memory()[0]
+            blocks = sys.getallocatedblocks()
+            tracemalloc.reset_peak()
+            stage(state)
+            # Blocks still allocated after the stage: the lists and strings it built and handed on
+            memory[name] = {
+                'peak_bytes': tracemalloc.get_traced_memory()[1] - baseline,
+                'retained_blocks': sys.getallocatedblocks() - blocks,
+            }
+    finally:
+        tracemalloc.stop()
+    return memory
+
+
+def measure_case(left, right, repeats: int) -> dict:
+    runs = [time_stages(left, right) for _ in range(repeats)]
+    memory = memory_by_stage(left, right)
+    return {
+        'lines': runs[0]['lines'],
+        'stages': {name: {**memory[name], 'seconds': min(run[name] for run in runs)} for name in STAGES},
+    }
+
+
+IMPORT_STATEMENTS = {
+    'package': 'import jpprint',
+    'jpprint': 'from jpprint import jpprint',
+}
+
+
+def import_microseconds(statement: str) -> int:
+    # A fresh interpreter per run, since a warm sys.modules would hide the cost being measured
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, sys.path)))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True,
+        check=True,
+        env=environment,
+        text=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        _, _, cumulative, name = line.replace(':', '|', 1).split('|')
+        # Nested entries are indented past the single separating space and already sit in a parent's total.
+        # Every top-level entry counts, since jpprint.core is loaded by importlib from __getattr__ and
+        # third-party or stdlib modules imported on first use are part of the cost too.
+        if not name.startswith('  ') and cumulative.strip().isdigit():
+            total += int(cumulative)
+    return total
+
+
+def measure_import_times(repeats: int) -> dict:
+    # Interpreter startup imports (encodings, site, ...) are measured once and subtracted
+    baseline = min(import_microseconds('pass') for _ in range(repeats))
+    return {
+        name: max(min(import_microseconds(statement) for _ in range(repeats)) - baseline, 0) / 1e6
+        for name, statement in IMPORT_STATEMENTS.items()
+    }
+
+
+def git_commit() -> str:
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, check=True, text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return result.stdout.strip()
+
+
+def run_suite(cases: list | None = None, repeats: int = 3, scale: int = 1) -> dict:
+    pairs = case_pairs(scale)
+    selected = cases or sorted(pairs)
+    unknown = set(selected) - set(pairs)
+    if unknown:
+        raise ValueError(f'Unknown benchmark cases: {", ".join(sorted(unknown))}')
+    return {
+        'cases': {name: measure_case(*pairs[name], repeats) for name in selected},
+        'commit': git_commit(),
+        'imports': measure_import_times(repeats),
+        'python': platform.python_version(),
+        'repeats': repeats,
+        'scale': scale,
+    }
+
+
+def exceeds(old: float, new: float, threshold: float, min_delta: float) -> bool:
+    return new > old * (1 + threshold) and new - old > min_delta
+
+
+def import_regressions(baseline: dict, current: dict, threshold: float) -> list[str]:
+    regressions = []
+    for name, new in current.get('imports', {}).items():
+        old = baseline.get('imports', {}).get(name)
+        if old is not None and exceeds(old, new, threshold, MIN_SECONDS_DELTA):
+            regressions.append(f'import/{name}: time {old:.4f}s -> {new:.4f}s')
+    return regressions
+
+
+def stage_regressions(name: str, old: dict, new: dict, threshold: float) -> list[str]:
+    regressions = []
+    if exceeds(old['seconds'], new['seconds'], threshold, MIN_SECONDS_DELTA):
+        regressions.append(f'{name}: time {old["seconds"]:.4f}s -> {new["seconds"]:.4f}s')
+    if exceeds(old['peak_bytes'], new['peak_bytes'], threshold, MIN_BYTES_DELTA):
+        regressions.append(f'{name}: memory {old["peak_bytes"]:,}B -> {new["peak_bytes"]:,}B')
+    # Baselines recorded before block counts were tracked simply skip this check
+    old_blocks = old.get('retained_blocks')
+    if old_blocks is not None and exceeds(old_blocks, new['retained_blocks'], threshold, MIN_BLOCKS_DELTA):
+        regressions.append(f'{name}: blocks {old_blocks:,} -> {new["retained_blocks"]:,}')
+    return regressions
+
+
+def find_regressions(baseline: dict, current: dict, threshold: float) -> list[str]:
+    regressions = import_regressions(baseline, current, threshold)
+    for case, result in current['cases'].items():
+        old_stages = baseline['cases'].get(case, {}).get('stages', {})
+        for stage, new in result['stages'].items():
+            if stage in old_stages:
+                regressions.extend(stage_regressions(f'{case}/{stage}', old_stages[stage], new, threshold))
+    return regressions
@@ -1,13 +1,62 @@
-from .colors import ColorCode, DiffType, apply_line_color, classify_diff_type, strip_color
-from .core import jpprint
-from .formatter import max_len
+_EXPORTS = {
+    'CallbackSink': 'sinks',
+    'ColorCode': 'colors',
+    'DiffSession': 'session',
+    'DiffStats': 'stats',
+    'DiffType': 'colors',
+    'FileSink': 'sinks',
+    'MemorySink': 'sinks',
+    'PagerSink': 'sinks',
+    'Sink': 'sinks',
+    'StreamSink': 'sinks',
+    'adiff': 'aio',
+    'adiff_rows': 'aio',
+    'apply_line_color': 'colors',
+    'classify_diff_type': 'colors',
+    'html_diff': 'html_output',
+    'jpprint': 'core',
+    'jpprint3': 'three_way',
+    'jpprint_ndjson': 'ndjson',
+    'max_len': 'formatter',
+    'ndjson_rows': 'ndjson',
+    'strip_color': 'colors',
+}
 
 __all__ = [
+    'CallbackSink',
     'ColorCode',
+    'DiffSession',
+    'DiffStats',
     'DiffType',
+    'FileSink',
+    'MemorySink',
+    'PagerSink',
+    'Sink',
+    'StreamSink',
+    'adiff',
+    'adiff_rows',
     'apply_line_color',
     'classify_diff_type',
+    'html_diff',
     'jpprint',
+    'jpprint3',
+    'jpprint_ndjson',
     'max_len',
+    'ndjson_rows',
     'strip_color',
 ]
+
+
+# Submodules load on first attribute access so short-lived callers only pay for what they use
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    from importlib import import_module
+
+    value = getattr(import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
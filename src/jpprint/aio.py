@@ -0,0 +1,27 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from .core import diff_rows
+
+
+async def adiff_rows(f1, f2, chunk_size: int = 1000, executor=None, **options):
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size must be at least 1, got {chunk_size}')
+    if options.get('stats'):
+        raise ValueError('adiff does not support stats')
+    # The rows are a generator living in this process, and a generator cannot be pickled to a worker
+    if isinstance(executor, ProcessPoolExecutor):
+        raise TypeError('adiff needs a thread executor; rows are produced lazily and cannot cross processes')
+    loop = asyncio.get_running_loop()
+    rows = await loop.run_in_executor(executor, partial(diff_rows, f1, f2, options))
+    # Alignment runs lazily inside the generator, so each chunk pulled in the executor
+    # does a bounded slice of the work and hands control back to the loop in between
+    while chunk := await loop.run_in_executor(executor, list, islice(rows, chunk_size)):
+        for row in chunk:
+            yield row
+
+
+async def adiff(f1, f2, chunk_size: int = 1000, executor=None, **options) -> list[str]:
+    return [row async for row in adiff_rows(f1, f2, chunk_size=chunk_size, executor=executor, **options)]
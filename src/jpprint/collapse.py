@@ -0,0 +1,84 @@
+import json
+import re
+
+SUMMARY_MARKER = '\x00jpprint-summary:'
+SERIALIZED_MARKER = '\\u0000jpprint-summary:'
+# json.dumps escapes the NUL byte, so a summary token always serializes to exactly this shape
+SUMMARY_TOKEN = re.compile(r'"\\u0000jpprint-summary:((?:[^"\\]|\\.)*)"')
+
+
+def summarize(value) -> str:
+    if isinstance(value, dict):
+        noun = 'key' if len(value) == 1 else 'keys'
+        return f'{SUMMARY_MARKER}{{… {len(value):,} {noun}}}'
+    noun = 'item' if len(value) == 1 else 'items'
+    return f'{SUMMARY_MARKER}[… {len(value):,} {noun}]'
+
+
+def expand_summaries(text: str) -> str:
+    return SUMMARY_TOKEN.sub(lambda match: json.loads(f'"{match.group(1)}"'), text)
+
+
+def is_container(value) -> bool:
+    return isinstance(value, dict | list | tuple)
+
+
+class Collapser:
+    def __init__(self, collapse_equal_subtrees: bool, max_depth: int | None):
+        self.collapse_equal_subtrees = collapse_equal_subtrees
+        self.max_depth = max_depth
+
+    def beyond_depth(self, depth: int) -> bool:
+        return self.max_depth is not None and depth > self.max_depth
+
+    def should_collapse(self, left, right, depth: int) -> bool:
+        if depth == 0:
+            return False
+        if self.max_depth is not None and not self.beyond_depth(depth):
+            return False
+        if self.max_depth is None and not self.collapse_equal_subtrees:
+            return False
+        # A changed container stays expanded at any depth so the change itself is always shown
+        return left == right
+
+    def one_side(self, value, depth: int = 0):
+        if self.max_depth is None or not is_container(value):
+            return value
+        if depth > 0 and self.beyond_depth(depth):
+            return summarize(value)
+        if isinstance(value, dict):
+            return {key: self.one_side(child, depth + 1) for key, child in value.items()}
+        return [self.one_side(child, depth + 1) for child in value]
+
+    def pair(self, left, right, depth: int = 0) -> tuple:
+        same_shape = isinstance(left, dict) == isinstance(right, dict)
+        if not (is_container(left) and is_container(right) and same_shape):
+            return self.one_side(left, depth), self.one_side(right, depth)
+        if self.should_collapse(left, right, depth):
+            return summarize(left), summarize(right)
+        if isinstance(left, dict):
+            return self.pair_dicts(left, right, depth)
+        return self.pair_arrays(left, right, depth)
+
+    def pair_dicts(self, left: dict, right: dict, depth: int) -> tuple:
+        new_left = {}
+        new_right = {}
+        for key, child in left.items():
+            if key in right:
+                new_left[key], new_right[key] = self.pair(child, right[key], depth + 1)
+            else:
+                new_left[key] = self.one_side(child, depth + 1)
+        for key, child in right.items():
+            if key not in left:
+                new_right[key] = self.one_side(child, depth + 1)
+        return new_left, new_right
+
+    def pair_arrays(self, left, right, depth: int) -> tuple:
+        pairs = [self.pair(*children, depth + 1) for children in zip(left, right, strict=False)]
+        new_left = [pair[0] for pair in pairs] + [
+            self.one_side(child, depth + 1) for child in left[len(pairs) :]
+        ]
+        new_right = [pair[1] for pair in pairs] + [
+            self.one_side(child, depth + 1) for child in right[len(pairs) :]
+        ]
+        return new_left, new_right
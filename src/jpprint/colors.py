@@ -6,6 +6,7 @@ class ColorCode(Enum):
     RED = '\033[91m'
     GREEN = '\033[92m'
     YELLOW = '\033[93m'
+    MAGENTA = '\033[95m'
     RESET = '\033[0m'
 
 
@@ -14,6 +15,7 @@ class DiffType(Enum):
     ADDED = auto()
     DELETED = auto()
     MODIFIED = auto()
+    CONFLICT = auto()
 
 
 def colorize(text: str, color: ColorCode) -> str:
@@ -46,5 +48,7 @@ def apply_line_color(text: str, diff_type: DiffType, is_left: bool, use_colors:
         return colorize(text, ColorCode.GREEN)
     elif diff_type == DiffType.MODIFIED:
         return colorize(text, ColorCode.YELLOW)
+    elif diff_type == DiffType.CONFLICT:
+        return colorize(text, ColorCode.MAGENTA)
 
     return text
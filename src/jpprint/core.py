@@ -1,70 +1,186 @@
-from .formatter import formatter, max_len, truncate
-from .output import create_output
+from collections import namedtuple
 
+from .collapse import Collapser
+from .formatter import dump, prepare
+from .lines import Lines
+from .output import (
+    format_rows,
+    format_wrapped_rows,
+    instrumented_rows,
+    limit_bytes,
+    output_params,
+    render_lines,
+)
+from .paths import PathFilter, compile_path_filter
+from .semantic import reconcile
+from .sinks import emit_lines
+from .stats import DiffStats
 
-def set_options(options: dict) -> tuple:
-    align_lines = options.get('align_lines', True)
-    diff_ind = options.get('diff_ind', '<>')
-    diff_only = options.get('diff_only', False)
-    indent = options.get('indent', 4)
+DEFAULTS = {
+    'align_lines': True,
+    'chunk_size': 65536,
+    'collapse_equal_subtrees': False,
+    'diff_ind': '<>',
+    'diff_only': False,
+    'ensure_ascii': True,
+    'float_tolerance': None,
+    'ignore_paths': None,
+    'indent': 4,
+    'max_bytes': None,
+    'max_depth': None,
+    'max_width': None,
+    'only_paths': None,
+    'retr': False,
+    'separator': '|',
+    'show_ln': False,
+    'sink': None,
+    'stats': None,
+    'unordered_arrays': False,
+    'use_box_chars': True,
+    'use_colors': True,
+    'wrap': False,
+}
+Options = namedtuple('Options', DEFAULTS)
+
+
+def set_options(options: dict) -> Options:
+    float_tolerance = options.get('float_tolerance')
+    if float_tolerance is not None and not float_tolerance > 0:
+        raise ValueError(f'float_tolerance must be positive, got {float_tolerance!r}')
+    return Options(**{name: options.get(name, default) for name, default in DEFAULTS.items()})
+
+
+def normalize_pair(f1, f2, options: dict) -> tuple:
+    opts = set_options(options)
+    if opts.float_tolerance or opts.unordered_arrays:
+        f2 = reconcile(f1, f2, opts.float_tolerance, opts.unordered_arrays)
+    if opts.collapse_equal_subtrees or opts.max_depth is not None:
+        f1, f2 = Collapser(opts.collapse_equal_subtrees, opts.max_depth).pair(f1, f2)
+    return f1, f2
+
+
+def needs_joint_pass(options: dict) -> bool:
+    return any(
+        options.get(name) for name in ('collapse_equal_subtrees', 'float_tolerance', 'unordered_arrays')
+    ) or (options.get('max_depth') is not None)
+
+
+def path_filter_for(options: dict) -> PathFilter | None:
+    return compile_path_filter(options.get('ignore_paths'), options.get('only_paths'))
+
+
+def format_lines(f1, f2, options: dict) -> tuple[Lines, Lines]:
+    return filtered_lines(f1, f2, options, path_filter_for(options))
+
+
+def filtered_lines(f1, f2, options: dict, path_filter: PathFilter | None) -> tuple[Lines, Lines]:
+    opts = set_options(options)
+    f1, f2 = normalize_pair(prepare(f1, path_filter), prepare(f2, path_filter), options)
+    left = Lines(dump(f1, opts.indent, opts.ensure_ascii))
+    right = Lines(dump(f2, opts.indent, opts.ensure_ascii))
+    fit_width(options, left, right)
+    return left, right
+
+
+def fit_width(options: dict, *documents: Lines):
     max_width = options.get('max_width')
-    retr = options.get('retr', False)
-    separator = options.get('separator', '|')
-    show_ln = options.get('show_ln', False)
-    use_box_chars = options.get('use_box_chars', True)
-    use_colors = options.get('use_colors', True)
-    return (
-        align_lines,
-        diff_ind,
-        diff_only,
-        indent,
-        max_width,
-        retr,
-        separator,
-        show_ln,
-        use_box_chars,
-        use_colors,
+    # Wrapping keeps the full text and splits it at render time instead
+    if max_width and not options.get('wrap'):
+        for lines in documents:
+            lines.truncate(max_width)
+
+
+def format_single(f1, options: dict) -> str:
+    return filtered_single(f1, options, path_filter_for(options))
+
+
+def filtered_single(f1, options: dict, path_filter: PathFilter | None) -> str:
+    opts = set_options(options)
+    data = prepare(f1, path_filter)
+    if opts.max_depth is not None:
+        data = Collapser(False, opts.max_depth).one_side(data)
+    return dump(data, opts.indent, opts.ensure_ascii)
+
+
+def wrap_width() -> int:
+    import shutil
+
+    # Two equal columns plus the 10-character delimiter fill the terminal
+    return max((shutil.get_terminal_size().columns - 10) // 2, 20)
+
+
+def column_widths(left: Lines, right: Lines, max_width: int | None, wrap: bool) -> tuple[int, int]:
+    l1width = left.width
+    l2width = right.width
+    if not wrap:
+        return l1width, l2width
+    # Capping the columns keeps one very long line from padding every other row out to its width,
+    # and a missing side keeps one column so splitting its rows never divides by zero
+    limit = max_width or wrap_width()
+    return min(max(l1width, 1), limit), min(max(l2width, 1), limit)
+
+
+def diff_rows(f1, f2, options: dict):
+    opts = set_options(options)
+    left, right = format_lines(f1, f2, options)
+    l1width, l2width = column_widths(left, right, opts.max_width, opts.wrap)
+    params = output_params(
+        opts.diff_ind, l1width, l2width, opts.separator, opts.show_ln, opts.use_box_chars, opts.use_colors
     )
+    rows = render_lines(left.lines, right.lines, params, opts.diff_only, opts.align_lines, opts.wrap)
+    return limit_bytes(rows, opts.max_bytes) if opts.max_bytes else rows
+
+
+def instrumented_output(f1, f2, options: dict, stats: DiffStats):
+    opts = set_options(options)
+    with stats.stage('format'):
+        left, right = format_lines(f1, f2, options)
+    with stats.stage('width'):
+        l1width, l2width = column_widths(left, right, opts.max_width, opts.wrap)
+    params = output_params(
+        opts.diff_ind, l1width, l2width, opts.separator, opts.show_ln, opts.use_box_chars, opts.use_colors
+    )
+    render = format_wrapped_rows if opts.wrap else format_rows
+    rows = render(instrumented_rows(left.lines, right.lines, opts.align_lines, stats), params, opts.diff_only)
+    rows = limit_bytes(rows, opts.max_bytes) if opts.max_bytes else rows
+    # Timed as the rows are pulled, so stats see the same lazy pipeline as an uninstrumented diff
+    return stats.timed(rows, 'render')
+
+
+def tallied(rows, stats: DiffStats):
+    for row in rows:
+        stats.rows += 1
+        stats.bytes_emitted += (len(row) if row.isascii() else len(row.encode())) + 1
+        yield row
+
+
+def instrumented_jpprint(f1, f2, options: dict, callback) -> list[str] | None:
+    opts = set_options(options)
+    stats = DiffStats()
+    rows = instrumented_output(f1, f2, options, stats)
+    if opts.retr:
+        output = list(rows)
+        stats.rows = len(output)
+        callback(stats)
+        return output
+    with stats.stage('print'):
+        emit_lines(tallied(rows, stats), opts.sink, opts.chunk_size)
+    # An empty diff still prints its single newline
+    stats.bytes_emitted = max(stats.bytes_emitted, 1)
+    callback(stats)
 
 
 def jpprint(f1, f2=None, **options):
-    (
-        align_lines,
-        diff_ind,
-        diff_only,
-        indent,
-        max_width,
-        retr,
-        separator,
-        show_ln,
-        use_box_chars,
-        use_colors,
-    ) = set_options(options)
-    f1 = formatter(f1, indent)
+    opts = set_options(options)
     if f2 is None:
-        print(f1)
+        if opts.stats:
+            raise ValueError('Printing a single document does not support stats')
+        emit_lines([format_single(f1, options)], opts.sink, opts.chunk_size)
         return
-    f2 = formatter(f2, indent)
-    if max_width:
-        f1 = truncate(f1, max_width)
-        f2 = truncate(f2, max_width)
-    l1width = max_len(f1)
-    l2width = max_len(f2)
-    output = list(
-        create_output(
-            f1,
-            f2,
-            diff_ind,
-            separator,
-            diff_only,
-            show_ln,
-            l1width,
-            l2width,
-            use_colors,
-            use_box_chars,
-            align_lines,
-        )
-    )
-    if retr:
-        return output
-    print('\n'.join(output))
+    # The instrumented path is a separate branch so leaving stats unset costs nothing
+    if opts.stats:
+        return instrumented_jpprint(f1, f2, options, opts.stats)
+    rows = diff_rows(f1, f2, options)
+    if opts.retr:
+        return list(rows)
+    emit_lines(rows, opts.sink, opts.chunk_size)
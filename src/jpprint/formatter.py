@@ -1,31 +1,51 @@
-import datetime
 import json
-import uuid
 
+from .collapse import SERIALIZED_MARKER, expand_summaries
+from .lines import truncate_line
+from .paths import PathFilter
+from .width import document_width
 
-def datetime_or_default_handler(*args):
-    if isinstance(args[1], datetime.datetime | datetime.date):
-        return args[1].isoformat()
-    if isinstance(args[1], uuid.UUID):
-        return str(args[1])
-    return f'Unconvertable Type {type(args[1])} - {args[1]}'
 
+def datetime_or_default_handler(value):
+    # Imported on first use so plain JSON never pays for datetime/uuid
+    import datetime
+    import uuid
 
-json.JSONEncoder.default = datetime_or_default_handler
+    if isinstance(value, datetime.datetime | datetime.date):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return f'Unconvertable Type {type(value)} - {value}'
 
 
-def formatter(data, indent: int) -> str:
+def load(data):
     data = data.decode() if isinstance(data, bytes) else data
     try:
-        return json.dumps(json.loads(data), indent=indent, sort_keys=True)
+        return json.loads(data)
     except Exception:
-        return json.dumps(data, indent=indent, sort_keys=True)
+        return data
+
+
+def prepare(data, path_filter: PathFilter | None = None):
+    data = load(data)
+    return path_filter.apply(data) if path_filter else data
+
+
+def dump(data, indent: int, ensure_ascii: bool = True) -> str:
+    text = json.dumps(
+        data, default=datetime_or_default_handler, ensure_ascii=ensure_ascii, indent=indent, sort_keys=True
+    )
+    return expand_summaries(text) if SERIALIZED_MARKER in text else text
+
+
+def formatter(data, indent: int, path_filter: PathFilter | None = None) -> str:
+    return dump(prepare(data, path_filter), indent)
 
 
 def max_len(data: str) -> int:
-    return max(len(x) for x in data.split('\n'))
+    return document_width(data)
 
 
 def truncate(data: str, width: int) -> str:
-    ellipse = '...'
-    return '\n'.join([x[: width - 3] + ellipse if len(x) > width else x for x in data.split('\n')])
+    ascii_only = data.isascii()
+    return '\n'.join([truncate_line(x, width, ascii_only) for x in data.split('\n')])
@@ -0,0 +1,139 @@
+from collections import deque
+from functools import partial
+from html import escape
+from itertools import chain, count, groupby, islice
+
+from .colors import DiffType
+from .core import format_lines, set_options
+from .output import aligned_rows, row_delimiter, zipped_rows
+
+STYLE = """
+table.jpprint { border-collapse: collapse; font-family: monospace; }
+table.jpprint td { padding: 0 0.5em; white-space: pre; vertical-align: top; }
+table.jpprint td.delim { color: #888; text-align: center; }
+table.jpprint td.ln { color: #888; text-align: right; }
+tr.deleted td.left { background: #fdd; }
+tr.added td.right { background: #dfd; }
+tr.modified td.left, tr.modified td.right { background: #ffc; }
+tr.collapsed td { background: #eef; color: #558; text-align: center; }
+"""
+
+SCRIPT = """
+function jpExpand(id) {
+  document.getElementById('jp-c' + id).replaceWith(document.getElementById('jp-t' + id).content);
+  return false;
+}
+"""
+
+HEADER = (
+    '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>jpprint diff</title>\n'
+    f'<style>{STYLE}</style>\n<script>{SCRIPT}</script>\n</head>\n<body>\n<table class="jpprint">\n<tbody>\n'
+)
+FOOTER = '</tbody>\n</table>\n</body>\n</html>\n'
+
+
+def render_html_row(numbered_row: tuple, delims: dict, show_ln: bool) -> str:
+    line_no, (left_text, right_text, diff_type) = numbered_row
+    number = f'<td class="ln">{line_no}</td>' if show_ln else ''
+    return (
+        f'<tr class="{diff_type.name.lower()}">{number}<td class="left">{escape(left_text, quote=False)}</td>'
+        f'<td class="delim">{delims[diff_type]}</td><td class="right">{escape(right_text, quote=False)}</td></tr>\n'
+    )
+
+
+def collapsed_marker(run_id: int, hidden: int, columns: int, keep_collapsed: bool) -> str:
+    label = f'&#8943; {hidden:,} equal lines'
+    if keep_collapsed:
+        label = f'<a href="#jp-c{run_id}" onclick="return jpExpand({run_id})">{label}</a>'
+    return f'<tr class="collapsed" id="jp-c{run_id}"><td colspan="{columns}">{label}</td></tr>\n'
+
+
+def release_hidden(rows, tail: deque, context: int):
+    # Only the trailing context rows are held back, so a run of any length streams in bounded memory
+    for numbered_row in rows:
+        tail.append(numbered_row)
+        if len(tail) > context:
+            yield tail.popleft()
+
+
+def hidden_template(hidden, render, keep_collapsed: bool, run_id: int):
+    # An inert <template> is parsed but never laid out until its anchor is clicked
+    if keep_collapsed:
+        yield f'<template id="jp-t{run_id}">'
+    total = 0
+    for numbered_row in hidden:
+        total += 1
+        if keep_collapsed:
+            yield render(numbered_row)
+    if keep_collapsed:
+        yield '</template>\n'
+    return total
+
+
+def collapse_equal_run(
+    run, render, marker, collapse_after: int, context: int, keep_collapsed: bool, run_id: int
+):
+    head = list(islice(run, collapse_after + 1))
+    if len(head) <= collapse_after:
+        yield from map(render, head)
+        return
+    yield from map(render, head[:context])
+    tail = deque()
+    hidden = release_hidden(chain(head[context:], run), tail, context)
+    total = yield from hidden_template(hidden, render, keep_collapsed, run_id)
+    yield marker(run_id, total)
+    yield from map(render, tail)
+
+
+def html_pieces(rows, render, marker, collapse_after: int, context: int, keep_collapsed: bool):
+    run_ids = count(1)
+    for is_equal, run in groupby(rows, key=lambda numbered_row: numbered_row[1][2] == DiffType.EQUAL):
+        if is_equal:
+            yield from collapse_equal_run(
+                run, render, marker, collapse_after, context, keep_collapsed, next(run_ids)
+            )
+        else:
+            yield from map(render, run)
+
+
+def chunked(pieces, chunk_size: int):
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def html_diff(
+    f1,
+    f2,
+    chunk_size: int = 65536,
+    collapse_after: int = 50,
+    context: int = 3,
+    keep_collapsed: bool = True,
+    **options,
+):
+    if collapse_after < 2 * context:
+        raise ValueError(f'collapse_after ({collapse_after}) must be at least twice context ({context})')
+    if options.get('max_bytes'):
+        raise ValueError('html_diff does not support max_bytes: a cut-off would leave the markup unclosed')
+    opts = set_options(options)
+    left, right = format_lines(f1, f2, options)
+    row_source = aligned_rows if opts.align_lines else zipped_rows
+    rows = enumerate(row_source(left.lines, right.lines), 1)
+    if opts.diff_only:
+        rows = (numbered_row for numbered_row in rows if numbered_row[1][2] != DiffType.EQUAL)
+    delims = {
+        diff_type: row_delimiter(diff_type, opts.diff_ind, opts.separator, opts.use_box_chars)
+        for diff_type in DiffType
+    }
+    render = partial(render_html_row, delims=delims, show_ln=opts.show_ln)
+    marker = partial(collapsed_marker, columns=4 if opts.show_ln else 3, keep_collapsed=keep_collapsed)
+    body = html_pieces(rows, render, marker, collapse_after, context, keep_collapsed)
+    yield from chunked(chain([HEADER], body, [FOOTER]), chunk_size)
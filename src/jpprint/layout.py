@@ -0,0 +1,225 @@
+import pickle
+from functools import partial
+from itertools import accumulate, compress, count
+from operator import ne
+
+from .formatter import dump
+from .lines import truncate_line
+
+# Pickles tell 1, 1.0 and True apart where == does not, and map() keeps the pickling in C
+fingerprint = partial(pickle.dumps, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class Block:
+    __slots__ = ('children', 'keys', 'size', 'sizes')
+
+    def __init__(self, keys: list | None, children: list | None, sizes: list | None, size: int):
+        self.children = children
+        self.keys = keys
+        self.size = size
+        self.sizes = sizes
+
+
+def is_object(value) -> bool:
+    return isinstance(value, dict) and bool(value)
+
+
+def is_array(value) -> bool:
+    return isinstance(value, list | tuple) and bool(value)
+
+
+def size_of(block: Block | None) -> int:
+    return block.size if block else 1
+
+
+def ordered(value) -> tuple:
+    """Return (sorted keys or None, child values) in the order json serializes them."""
+    if isinstance(value, dict):
+        keys = sorted(value)
+        return keys, [value[key] for key in keys]
+    return None, list(value)
+
+
+def build(value) -> Block | None:
+    # Scalars and empty containers always serialize to one line, so they need no block
+    if not (is_object(value) or is_array(value)):
+        return None
+    keys, values = ordered(value)
+    children = list(map(build, values))
+    sizes = list(map(size_of, children))
+    # Non-string keys are converted and reordered by json, so such objects are only ever replaced whole
+    if keys and not all(isinstance(key, str) for key in keys):
+        return Block(None, None, None, 2 + sum(sizes))
+    return Block(keys, children, sizes, 2 + sum(sizes))
+
+
+def changed_window(old: list, new: list) -> tuple[int, int, int]:
+    limit = min(len(old), len(new))
+    # map/compress keep the scan in C, so an unchanged prefix costs far less than a Python loop
+    lo = next(compress(count(), map(ne, old, new)), limit)
+    tail_limit = limit - lo
+    tail = next(compress(count(), map(ne, reversed(old), reversed(new))), tail_limit)
+    tail = min(tail, tail_limit)
+    return lo, len(old) - tail, len(new) - tail
+
+
+def merged_keys(old_keys: list, new_keys: list):
+    """Yield (old index, new index, insertion point) for sorted keys, with None on the side a key is missing from."""
+    i = j = 0
+    while i < len(old_keys) or j < len(new_keys):
+        if j == len(new_keys) or (i < len(old_keys) and old_keys[i] < new_keys[j]):
+            yield i, None, i
+            i += 1
+        elif i == len(old_keys) or new_keys[j] < old_keys[i]:
+            yield None, j, i
+            j += 1
+        else:
+            yield i, j, i
+            i += 1
+            j += 1
+
+
+def array_pairs(old_prints: list, new_prints: list) -> list[tuple]:
+    lo, old_hi, new_hi = changed_window(old_prints, new_prints)
+    common = min(old_hi, new_hi)
+    # With no common tail the entry before the edit may gain or lose the last place
+    pairs = [(lo - 1, lo - 1, lo - 1)] if lo and old_hi == len(old_prints) else []
+    pairs += [(index, index, index) for index in range(lo, common)]
+    pairs += [(index, None, index) for index in range(common, old_hi)]
+    pairs += [(None, index, old_hi) for index in range(common, new_hi)]
+    return pairs
+
+
+def key_pairs(old_keys: list, new_keys: list, old_prints: list, new_prints: list) -> list[tuple]:
+    last = (len(old_keys) - 1, len(new_keys) - 1)
+    return [
+        (i, j, at)
+        for i, j, at in merged_keys(old_keys, new_keys)
+        if i is None or j is None or i == last[0] or j == last[1] or old_prints[i] != new_prints[j]
+    ]
+
+
+def touched_pairs(old_keys: list | None, new_keys: list | None, old_prints: list, new_prints: list) -> list:
+    """Return (old index, new index, insertion point) for every entry that may serialize differently."""
+    if old_keys == new_keys and len(old_prints) == len(new_prints):
+        return [(index, index, index) for index in compress(count(), map(ne, old_prints, new_prints))]
+    if old_keys is None:
+        return array_pairs(old_prints, new_prints)
+    return key_pairs(old_keys, new_keys, old_prints, new_prints)
+
+
+class DocumentLayout:
+    """Serialized lines of one document, patched by re-serializing only the subtrees an update changed."""
+
+    def __init__(self, data, indent, ensure_ascii: bool, max_width: int | None):
+        self.ensure_ascii = ensure_ascii
+        self.indent = indent
+        self.max_width = max_width
+        self.reset(data)
+
+    def reset(self, data):
+        self.block = build(data)
+        self.lines = self.finish(dump(data, self.indent, self.ensure_ascii).split('\n'))
+        # The previous version is kept as pickles, so callers may mutate the data they passed in
+        self.prints = self.fingerprints(data) if self.patchable(self.block, data) else None
+
+    def fingerprints(self, data) -> list[bytes] | None:
+        try:
+            return list(map(fingerprint, ordered(data)[1]))
+        except Exception:
+            return None
+
+    def finish(self, lines: list[str]) -> list[str]:
+        if not self.max_width:
+            return lines
+        return [truncate_line(line, self.max_width, line.isascii()) for line in lines]
+
+    def update(self, data) -> list[str]:
+        # Without an indent the document is a single line, so there is nothing to patch
+        prints = self.fingerprints(data) if self.prints and self.patchable(self.block, data) else None
+        if self.indent is None or prints is None:
+            self.reset(data)
+            return self.lines
+        self.splices = []
+        self.growth = 0
+        keys, values = ordered(data)
+        self.block = self.patch_container(self.prints, keys, values, prints, self.block, 0, 0)
+        self.prints = prints
+        self.lines = self.spliced()
+        return self.lines
+
+    def patchable(self, block: Block | None, new) -> bool:
+        if block is None or block.children is None:
+            return False
+        if block.keys is None:
+            return is_array(new)
+        return is_object(new) and all(isinstance(key, str) for key in new)
+
+    def patch_entry(
+        self, key, old_print: bytes, value, block: Block | None, start: int, depth: int, last: bool
+    ):
+        if old_print == fingerprint(value):
+            return block
+        if not self.patchable(block, value):
+            return self.replace(start, size_of(block), key, value, depth, last)
+        old_prints = list(map(fingerprint, ordered(pickle.loads(old_print))[1]))
+        keys, values = ordered(value)
+        prints = list(map(fingerprint, values))
+        return self.patch_container(old_prints, keys, values, prints, block, start, depth)
+
+    def patch_container(
+        self, old_prints, keys, values, prints, block: Block, start: int, depth: int
+    ) -> Block:
+        growth = self.growth
+        offsets = list(accumulate(block.sizes, initial=start + 1))
+        children = []
+        sizes = []
+        position = 0
+        for i, j, at in touched_pairs(block.keys, keys, old_prints, prints):
+            children += block.children[position:at]
+            sizes += block.sizes[position:at]
+            position = at if i is None else i + 1
+            if j is None:
+                self.splice(offsets[at], block.sizes[i], [])
+                continue
+            child = self.patch_pair(old_prints, values, block, (i, j), offsets[at], depth + 1, keys)
+            children.append(child)
+            sizes.append(size_of(child))
+        children += block.children[position:]
+        sizes += block.sizes[position:]
+        return Block(keys, children, sizes, block.size + self.growth - growth)
+
+    def patch_pair(self, old_prints, values, block: Block, pair: tuple, start: int, depth: int, keys):
+        i, j = pair
+        key = None if keys is None else keys[j]
+        last = j == len(values) - 1
+        # An entry that gains or loses the last place also gains or loses its trailing comma
+        if i is None or (i == len(old_prints) - 1) != last:
+            size = 0 if i is None else block.sizes[i]
+            return self.replace(start, size, key, values[j], depth, last)
+        return self.patch_entry(key, old_prints[i], values[j], block.children[i], start, depth, last)
+
+    def replace(self, start: int, size: int, key, value, depth: int, last: bool) -> Block | None:
+        # A one-entry container serializes the entry exactly as json would inside its parent
+        wrapper = [value] if key is None else {key: value}
+        lines = dump(wrapper, self.indent, self.ensure_ascii).split('\n')[1:-1]
+        prefix = (' ' * self.indent if isinstance(self.indent, int) else self.indent) * (depth - 1)
+        lines = [prefix + line for line in lines]
+        if not last:
+            lines[-1] += ','
+        self.splice(start, size, self.finish(lines))
+        return build(value)
+
+    def splice(self, start: int, size: int, lines: list[str]):
+        self.splices.append((start, size, lines))
+        self.growth += len(lines) - size
+
+    def spliced(self) -> list[str]:
+        lines = []
+        position = 0
+        for start, size, new_lines in self.splices:
+            lines += self.lines[position:start]
+            lines += new_lines
+            position = start + size
+        lines += self.lines[position:]
+        return lines
@@ -0,0 +1,37 @@
+from .width import clip, text_width
+
+ELLIPSIS = '...'
+
+
+def truncate_line(line: str, width: int, ascii_only: bool) -> str:
+    if ascii_only:
+        return line[: width - 3] + ELLIPSIS if len(line) > width else line
+    return clip(line, width - 3) + ELLIPSIS if text_width(line) > width else line
+
+
+class Lines:
+    """Formatted text split once, shared by every stage after serialization."""
+
+    __slots__ = ('ascii', 'lines', '_width')
+
+    def __init__(self, text: str):
+        # Checked once per document so ASCII documents never measure a line character by character
+        self.ascii = text.isascii()
+        self.lines = text.split('\n') if text else []
+        self._width = None
+
+    @property
+    def width(self) -> int:
+        if self._width is None:
+            # Only the widest line is kept; per-line widths would cost a list per document for one lookup
+            measure = len if self.ascii else text_width
+            self._width = max(map(measure, self.lines), default=0)
+        return self._width
+
+    def truncate(self, width: int):
+        # Lines that already fit are kept as the same string objects, so only cut lines allocate
+        self.lines = [truncate_line(line, width, self.ascii) for line in self.lines]
+        self._width = None
+
+    def text(self) -> str:
+        return '\n'.join(self.lines)
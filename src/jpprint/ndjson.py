@@ -0,0 +1,172 @@
+import json
+import os
+from collections import deque
+from itertools import chain, zip_longest
+
+from .core import column_widths, filtered_lines, filtered_single, fit_width, path_filter_for, set_options
+from .lines import Lines
+from .output import limit_bytes, output_params, render_lines
+from .paths import PathFilter
+from .sinks import emit_lines
+
+MISSING = object()
+# Options that belong to the caller, not to rendering a record pair, and may not survive pickling
+CALLER_OPTIONS = ('max_bytes', 'retr', 'sink', 'stats')
+
+
+def read_records(source):
+    if isinstance(source, str | os.PathLike):
+        with open(source, 'rb') as handle:
+            yield from read_records(handle)
+        return
+    for line_no, line in enumerate(source, 1):
+        if not isinstance(line, str | bytes):
+            yield line
+        elif line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                raise ValueError(f'Invalid JSON on line {line_no}: {error}') from None
+
+
+def key_function(key):
+    def field(record):
+        try:
+            return record[key]
+        except (KeyError, IndexError, TypeError):
+            raise ValueError(f'Record has no {key!r} field: {record!r}') from None
+
+    get_key = key if callable(key) else field
+
+    def hashable_key(record):
+        value = get_key(record)
+        try:
+            hash(value)
+        except TypeError:
+            raise ValueError(f'Key {value!r} is not hashable: {record!r}') from None
+        return value
+
+    return hashable_key
+
+
+def label_for(key, value) -> str:
+    name = getattr(key, '__name__', 'key') if callable(key) else key
+    return f'{name}={json.dumps(value, default=str)}'
+
+
+def pairs_by_position(left, right):
+    for index, (left_record, right_record) in enumerate(zip_longest(left, right, fillvalue=MISSING), 1):
+        yield f'record {index}', left_record, right_record
+
+
+def alternating(left, right):
+    # Reading both inputs in step keeps records of in-order streams waiting only briefly
+    for records in zip_longest(left, right, fillvalue=MISSING):
+        yield from ((side, record) for side, record in enumerate(records) if record is not MISSING)
+
+
+def pairs_by_key(left, right, key):
+    """Pair records sharing a key; only records still waiting for their partner are held in memory."""
+    get_key = key_function(key)
+    pending = ({}, {})
+    for side, record in alternating(left, right):
+        value = get_key(record)
+        partner = take_pending(pending[1 - side], value)
+        if partner is MISSING:
+            # Records repeating a key queue up and pair in input order
+            pending[side].setdefault(value, deque()).append(record)
+            continue
+        yield label_for(key, value), *oriented(side, record, partner)
+    for side, waiting in enumerate(pending):
+        for value, records in waiting.items():
+            yield from ((label_for(key, value), *oriented(side, record, MISSING)) for record in records)
+
+
+def take_pending(waiting: dict, value):
+    records = waiting.get(value)
+    if not records:
+        return MISSING
+    record = records.popleft()
+    if not records:
+        del waiting[value]
+    return record
+
+
+def oriented(side: int, record, other) -> tuple:
+    return (other, record) if side else (record, other)
+
+
+def missing_side(left_record, right_record) -> int | None:
+    if left_record is MISSING:
+        return 0
+    return 1 if right_record is MISSING else None
+
+
+def render_pair(
+    label: str,
+    left_record,
+    right_record,
+    missing: int | None,
+    options: dict,
+    path_filter: PathFilter | None,
+) -> list[str]:
+    opts = set_options(options)
+    if missing is not None:
+        lines = Lines(filtered_single(right_record if missing == 0 else left_record, options, path_filter))
+        fit_width(options, lines)
+        left, right = (Lines(''), lines) if missing == 0 else (lines, Lines(''))
+    else:
+        left, right = filtered_lines(left_record, right_record, options, path_filter)
+    if opts.diff_only and left.lines == right.lines:
+        return []
+    l1width, l2width = column_widths(left, right, opts.max_width, opts.wrap)
+    params = output_params(
+        opts.diff_ind, l1width, l2width, opts.separator, opts.show_ln, opts.use_box_chars, opts.use_colors
+    )
+    rows = render_lines(left.lines, right.lines, params, opts.diff_only, opts.align_lines, opts.wrap)
+    return [f'@@ {label} @@', *rows]
+
+
+def rendered_pairs(pairs, executor, max_pending: int, options: dict, path_filter: PathFilter | None):
+    # Decided here because MISSING is a different object once pickled into a worker process
+    pairs = ((label, left, right, missing_side(left, right)) for label, left, right in pairs)
+    if executor is None:
+        for pair in pairs:
+            yield render_pair(*pair, options, path_filter)
+        return
+    # A bounded window of in-flight pairs keeps parallel rendering from reading the whole input ahead
+    in_flight = deque()
+    for pair in pairs:
+        in_flight.append(executor.submit(render_pair, *pair, options, path_filter))
+        if len(in_flight) >= max_pending:
+            yield in_flight.popleft().result()
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+def ndjson_rows(left, right, executor=None, key=None, max_pending: int = 64, **options):
+    if max_pending < 1:
+        raise ValueError(f'max_pending must be at least 1, got {max_pending}')
+    if options.get('stats'):
+        raise ValueError('NDJSON diffs do not support stats')
+    left_records = read_records(left)
+    right_records = read_records(right)
+    if key is None:
+        pairs = pairs_by_position(left_records, right_records)
+    else:
+        pairs = pairs_by_key(left_records, right_records, key)
+    pair_options = {name: value for name, value in options.items() if name not in CALLER_OPTIONS}
+    # Compiled once here, so every pair shares the matcher and its cache of trie steps
+    path_filter = path_filter_for(options)
+    rows = chain.from_iterable(rendered_pairs(pairs, executor, max_pending, pair_options, path_filter))
+    max_bytes = options.get('max_bytes')
+    # Stopping at the cap also stops reading both inputs
+    yield from limit_bytes(rows, max_bytes) if max_bytes else rows
+
+
+def jpprint_ndjson(left, right, executor=None, key=None, max_pending: int = 64, **options):
+    opts = set_options(options)
+    rows = ndjson_rows(left, right, executor=executor, key=key, max_pending=max_pending, **options)
+    if opts.retr:
+        return list(rows)
+    emit_lines(rows, opts.sink, opts.chunk_size)
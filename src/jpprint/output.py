@@ -2,9 +2,21 @@ import difflib
 from itertools import zip_longest
 
 from .colors import DiffType, apply_line_color, classify_diff_type
+from .stats import DiffStats
+from .width import pad, split_width
 
 BOX_SEPARATOR = '│'
 BOX_DIFF_INDICATOR = '◆'
+BOX_CONFLICT_INDICATOR = '✖'
+CONFLICT_INDICATOR = '!!'
+
+
+def row_delimiter(diff_type: DiffType, diff_ind: str, separator: str, use_box_chars: bool) -> str:
+    if diff_type == DiffType.CONFLICT:
+        return BOX_CONFLICT_INDICATOR if use_box_chars else CONFLICT_INDICATOR
+    if use_box_chars:
+        return BOX_SEPARATOR if diff_type == DiffType.EQUAL else BOX_DIFF_INDICATOR
+    return separator if diff_type == DiffType.EQUAL else diff_ind
 
 
 def format_diff_line(
@@ -20,14 +32,10 @@ def format_diff_line(
     use_box_chars: bool,
     use_colors: bool,
 ) -> str:
-    delim = (
-        (BOX_SEPARATOR if diff_type == DiffType.EQUAL else BOX_DIFF_INDICATOR)
-        if use_box_chars
-        else (separator if diff_type == DiffType.EQUAL else diff_ind)
-    )
+    delim = row_delimiter(diff_type, diff_ind, separator, use_box_chars)
 
-    l1_padded = '{:{width}}'.format(left_text, width=l1width)
-    l2_padded = '{:{width}}'.format(right_text, width=l2width)
+    l1_padded = pad(left_text, l1width)
+    l2_padded = pad(right_text, l2width)
 
     l1_colored = apply_line_color(l1_padded, diff_type, is_left=True, use_colors=use_colors)
     l2_colored = apply_line_color(l2_padded, diff_type, is_left=False, use_colors=use_colors)
@@ -35,24 +43,19 @@ def format_diff_line(
     return '{}{}{:^10}{}'.format(line_no if show_ln else '', l1_colored, delim, l2_colored)
 
 
-def process_equal_lines(left_lines, right_lines, i1, i2, j1, j2, params, diff_only):
+def process_equal_lines(left_lines, right_lines, i1, i2, j1, j2):
     for l_line, r_line in zip(left_lines[i1:i2], right_lines[j1:j2], strict=False):
-        params['line_no'] += 1
-        if diff_only:
-            continue
-        yield format_diff_line(l_line, r_line, DiffType.EQUAL, **params)
+        yield l_line, r_line, DiffType.EQUAL
 
 
-def process_delete_lines(left_lines, i1, i2, params):
+def process_delete_lines(left_lines, i1, i2):
     for l_line in left_lines[i1:i2]:
-        params['line_no'] += 1
-        yield format_diff_line(l_line, '', DiffType.DELETED, **params)
+        yield l_line, '', DiffType.DELETED
 
 
-def process_insert_lines(right_lines, j1, j2, params):
+def process_insert_lines(right_lines, j1, j2):
     for r_line in right_lines[j1:j2]:
-        params['line_no'] += 1
-        yield format_diff_line('', r_line, DiffType.ADDED, **params)
+        yield '', r_line, DiffType.ADDED
 
 
 def extract_json_key(line: str) -> str:
@@ -94,7 +97,7 @@ def create_left_to_right_mapping(matched_pairs: list, left_block: list) -> dict:
     return left_to_right
 
 
-def process_replace_lines(left_lines, right_lines, i1, i2, j1, j2, params):
+def process_replace_lines(left_lines, right_lines, i1, i2, j1, j2):
     left_block = left_lines[i1:i2]
     right_block = right_lines[j1:j2]
 
@@ -103,36 +106,111 @@ def process_replace_lines(left_lines, right_lines, i1, i2, j1, j2, params):
 
     # Process left lines in order
     for idx, left_line in enumerate(left_block):
-        params['line_no'] += 1
         if idx in left_to_right:
-            yield format_diff_line(left_line, left_to_right[idx], DiffType.MODIFIED, **params)
+            yield left_line, left_to_right[idx], DiffType.MODIFIED
         else:
-            yield format_diff_line(left_line, '', DiffType.DELETED, **params)
+            yield left_line, '', DiffType.DELETED
 
     # Show unmatched right lines (added)
     for idx, line in enumerate(right_block):
         if idx not in processed_right:
-            params['line_no'] += 1
-            yield format_diff_line('', line, DiffType.ADDED, **params)
+            yield '', line, DiffType.ADDED
+
+
+def opcode_rows(opcode: tuple, left_lines: list, right_lines: list):
+    tag, i1, i2, j1, j2 = opcode
+    if tag == 'equal':
+        yield from process_equal_lines(left_lines, right_lines, i1, i2, j1, j2)
+    elif tag == 'delete':
+        yield from process_delete_lines(left_lines, i1, i2)
+    elif tag == 'insert':
+        yield from process_insert_lines(right_lines, j1, j2)
+    elif tag == 'replace':
+        yield from process_replace_lines(left_lines, right_lines, i1, i2, j1, j2)
+
+
+def aligned_opcodes(left_lines: list, right_lines: list) -> list[tuple]:
+    # Identical sides, common once semantic normalization has removed the noise, need no matching
+    if left_lines == right_lines:
+        return [('equal', 0, len(left_lines), 0, len(right_lines))]
+    return difflib.SequenceMatcher(None, left_lines, right_lines).get_opcodes()
+
+
+def aligned_rows(left_lines: list, right_lines: list):
+    for opcode in aligned_opcodes(left_lines, right_lines):
+        yield from opcode_rows(opcode, left_lines, right_lines)
+
+
+def instrumented_rows(left_lines: list, right_lines: list, align_lines: bool, stats: DiffStats):
+    stats.left_lines = len(left_lines)
+    stats.right_lines = len(right_lines)
+    if not align_lines:
+        yield from stats.timed(zipped_rows(left_lines, right_lines), 'align')
+        return
+    with stats.stage('match'):
+        opcodes = aligned_opcodes(left_lines, right_lines)
+    for opcode in opcodes:
+        stats.record_opcode(opcode)
+        yield from stats.timed(
+            opcode_rows(opcode, left_lines, right_lines), 'replace' if opcode[0] == 'replace' else 'align'
+        )
 
 
-def create_output_aligned(
-    f1: str,
-    f2: str,
+def zipped_rows(left_lines: list, right_lines: list):
+    # Original zip_longest behavior for backward compatibility
+    for l1, l2 in zip_longest(left_lines, right_lines, fillvalue=' '):
+        yield l1, l2, classify_diff_type(l1, l2, fillvalue=' ')
+
+
+def format_rows(rows, params: dict, diff_only: bool):
+    for left_text, right_text, diff_type in rows:
+        params['line_no'] += 1
+        if diff_only and diff_type == DiffType.EQUAL:
+            continue
+        yield format_diff_line(left_text, right_text, diff_type, **params)
+
+
+def format_wrapped_rows(rows, params: dict, diff_only: bool):
+    for left_text, right_text, diff_type in rows:
+        params['line_no'] += 1
+        if diff_only and diff_type == DiffType.EQUAL:
+            continue
+        pieces = zip_longest(
+            split_width(left_text, params['l1width']),
+            split_width(right_text, params['l2width']),
+            fillvalue='',
+        )
+        # Continuation rows share the logical row's number, blanked so the columns stay put
+        line_no = params['line_no']
+        for left_piece, right_piece in pieces:
+            yield format_diff_line(left_piece, right_piece, diff_type, **{**params, 'line_no': line_no})
+            line_no = ' ' * len(str(line_no))
+
+
+def limit_bytes(rows, max_bytes: int):
+    used = 0
+    for row in rows:
+        used += (len(row) if row.isascii() else len(row.encode())) + 1
+        if used > max_bytes:
+            yield f'... output truncated at {max_bytes:,} bytes'
+            return
+        yield row
+
+
+def render_opcode(opcode: tuple, left_lines: list, right_lines: list, params: dict, diff_only: bool):
+    yield from format_rows(opcode_rows(opcode, left_lines, right_lines), params, diff_only)
+
+
+def output_params(
     diff_ind: str,
-    separator: str,
-    diff_only: bool,
-    show_ln: bool,
     l1width: int,
     l2width: int,
-    use_colors: bool,
+    separator: str,
+    show_ln: bool,
     use_box_chars: bool,
-):
-    left_lines = f1.splitlines()
-    right_lines = f2.splitlines()
-
-    matcher = difflib.SequenceMatcher(None, left_lines, right_lines)
-    params = {
+    use_colors: bool,
+) -> dict:
+    return {
         'diff_ind': diff_ind,
         'l1width': l1width,
         'l2width': l2width,
@@ -143,18 +221,8 @@ def create_output_aligned(
         'use_colors': use_colors,
     }
 
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-        if tag == 'equal':
-            yield from process_equal_lines(left_lines, right_lines, i1, i2, j1, j2, params, diff_only)
-        elif tag == 'delete':
-            yield from process_delete_lines(left_lines, i1, i2, params)
-        elif tag == 'insert':
-            yield from process_insert_lines(right_lines, j1, j2, params)
-        elif tag == 'replace':
-            yield from process_replace_lines(left_lines, right_lines, i1, i2, j1, j2, params)
-
 
-def create_output(
+def create_output_aligned(
     f1: str,
     f2: str,
     diff_ind: str,
@@ -164,30 +232,33 @@ def create_output(
     l1width: int,
     l2width: int,
     use_colors: bool,
-    use_box_chars: bool = False,
-    align_lines: bool = True,
+    use_box_chars: bool,
 ):
-    if align_lines:
-        yield from create_output_aligned(
-            f1, f2, diff_ind, separator, diff_only, show_ln, l1width, l2width, use_colors, use_box_chars
-        )
-    else:
-        # Original zip_longest behavior for backward compatibility
-        for line_no, (l1, l2) in enumerate(zip_longest(f1.splitlines(), f2.splitlines(), fillvalue=' '), 1):
-            diff_type = classify_diff_type(l1, l2, fillvalue=' ')
-
-            if use_box_chars:
-                delim = BOX_DIFF_INDICATOR if l1 != l2 else BOX_SEPARATOR
-            else:
-                delim = diff_ind if l1 != l2 else separator
+    params = output_params(diff_ind, l1width, l2width, separator, show_ln, use_box_chars, use_colors)
+    yield from format_rows(aligned_rows(f1.splitlines(), f2.splitlines()), params, diff_only)
 
-            if diff_only and l1 == l2:
-                continue
 
-            l1_padded = '{:{width}}'.format(l1, width=l1width)
-            l2_padded = '{:{width}}'.format(l2, width=l2width)
+def render_lines(
+    left_lines: list, right_lines: list, params: dict, diff_only: bool, align_lines: bool, wrap: bool
+):
+    row_source = aligned_rows if align_lines else zipped_rows
+    render = format_wrapped_rows if wrap else format_rows
+    yield from render(row_source(left_lines, right_lines), params, diff_only)
 
-            l1_colored = apply_line_color(l1_padded, diff_type, is_left=True, use_colors=use_colors)
-            l2_colored = apply_line_color(l2_padded, diff_type, is_left=False, use_colors=use_colors)
 
-            yield '{}{}{:^10}{}'.format(line_no if show_ln else '', l1_colored, delim, l2_colored)
+def create_output(
+    f1: str,
+    f2: str,
+    diff_ind: str,
+    separator: str,
+    diff_only: bool,
+    show_ln: bool,
+    l1width: int,
+    l2width: int,
+    use_colors: bool,
+    use_box_chars: bool = False,
+    align_lines: bool = True,
+    wrap: bool = False,
+):
+    params = output_params(diff_ind, l1width, l2width, separator, show_ln, use_box_chars, use_colors)
+    yield from render_lines(f1.splitlines(), f2.splitlines(), params, diff_only, align_lines, wrap)
@@ -0,0 +1,156 @@
+import re
+
+TOKEN = re.compile(r'(\.\.|\.|)(?:\[([^\]]+)\]|([^.\[\]]+))')
+MISSING = object()
+
+
+class PathNode:
+    __slots__ = ('children', 'recursive', 'terminal')
+
+    def __init__(self, recursive: bool = False):
+        self.children = {}
+        self.recursive = recursive
+        self.terminal = False
+
+
+def path_tokens(path: str):
+    body = path[1:] if path.startswith('$') else path
+    position = 0
+    while position < len(body):
+        match = TOKEN.match(body, position)
+        # A key straight after a closing bracket needs a dot, as in items[0].id
+        if not match or (position and match.group(3) and not match.group(1)):
+            raise ValueError(f'Malformed path {path!r} at {body[position:]!r}')
+        yield match.groups()
+        position = match.end()
+
+
+def parse_path(path: str) -> list[str]:
+    segments = []
+    for separator, bracket, name in path_tokens(path):
+        # JSONPath's '..' descends any number of levels, which the trie spells '**'
+        if separator == '..':
+            segments.append('**')
+        segments.append(bracket.strip('\'"') if bracket else name)
+    if not segments:
+        raise ValueError(f'Path {path!r} does not name any key or index')
+    return segments
+
+
+def compile_trie(paths: list[str]) -> PathNode:
+    root = PathNode()
+    for path in paths:
+        node = root
+        for segment in parse_path(path):
+            if segment not in node.children:
+                node.children[segment] = PathNode(recursive=segment == '**')
+            node = node.children[segment]
+        node.terminal = True
+    return root
+
+
+def closure(node: PathNode) -> list[PathNode]:
+    # '**' also matches zero levels, so reaching a node means its '**' child is reached too
+    nodes = [node]
+    while '**' in node.children:
+        node = node.children['**']
+        nodes.append(node)
+    return nodes
+
+
+class PathMatcher:
+    def __init__(self, paths: list[str]):
+        self.root = tuple(closure(compile_trie(paths)))
+        self._steps = {}
+
+    def step(self, states: tuple, key: str) -> tuple:
+        # Keys the trie never names all advance the same way, which keeps the cache as small as the trie
+        literal = any(key in node.children for node in states)
+        cache_key = (states, key if literal else None)
+        if cache_key not in self._steps:
+            self._steps[cache_key] = self._advance(states, key)
+        return self._steps[cache_key]
+
+    def _advance(self, states: tuple, key: str) -> tuple:
+        reached = {}
+        for node in states:
+            candidates = [node.children.get(key), node.children.get('*'), node if node.recursive else None]
+            for child in filter(None, candidates):
+                reached.update((id(found), found) for found in closure(child))
+        return tuple(reached.values())
+
+
+def matched(states: tuple) -> bool:
+    return any(node.terminal for node in states)
+
+
+def children(value):
+    if isinstance(value, dict):
+        return ((key, str(key), child) for key, child in value.items())
+    return ((index, str(index), child) for index, child in enumerate(value))
+
+
+def rebuild(value, kept: list):
+    if isinstance(value, dict):
+        return dict(kept)
+    return [child for _, child in kept]
+
+
+def is_container(value) -> bool:
+    return isinstance(value, dict | list | tuple)
+
+
+def drop_ignored(value, matcher: PathMatcher, states: tuple):
+    kept = []
+    changed = False
+    for key, name, child in children(value):
+        child_states = matcher.step(states, name)
+        if matched(child_states):
+            changed = True
+            continue
+        if child_states and is_container(child):
+            pruned = drop_ignored(child, matcher, child_states)
+            changed = changed or pruned is not child
+            child = pruned
+        kept.append((key, child))
+    # Untouched containers are shared rather than copied, so unfiltered subtrees cost nothing extra
+    return rebuild(value, kept) if changed else value
+
+
+def keep_only(value, matcher: PathMatcher, states: tuple):
+    kept = []
+    for key, name, child in children(value):
+        child_states = matcher.step(states, name)
+        if matched(child_states):
+            kept.append((key, child))
+        elif child_states and is_container(child):
+            pruned = keep_only(child, matcher, child_states)
+            if pruned is not MISSING:
+                kept.append((key, pruned))
+    return rebuild(value, kept) if kept else MISSING
+
+
+class PathFilter:
+    def __init__(self, ignore_paths: list[str] | None = None, only_paths: list[str] | None = None):
+        self.ignore = PathMatcher(ignore_paths) if ignore_paths else None
+        self.only = PathMatcher(only_paths) if only_paths else None
+
+    def apply(self, data):
+        if not is_container(data):
+            return data
+        if self.only:
+            empty = {} if isinstance(data, dict) else []
+            data = keep_only(data, self.only, self.only.root)
+            data = empty if data is MISSING else data
+        if self.ignore:
+            data = drop_ignored(data, self.ignore, self.ignore.root)
+        return data
+
+
+def compile_path_filter(ignore_paths: list[str] | None, only_paths: list[str] | None) -> PathFilter | None:
+    if not ignore_paths and not only_paths:
+        return None
+    # A bare string is one path, not a list of one-character paths
+    ignore_paths = [ignore_paths] if isinstance(ignore_paths, str) else ignore_paths
+    only_paths = [only_paths] if isinstance(only_paths, str) else only_paths
+    return PathFilter(ignore_paths, only_paths)
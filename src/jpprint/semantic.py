@@ -0,0 +1,76 @@
+import json
+import math
+from collections import defaultdict, deque
+
+from .formatter import datetime_or_default_handler
+
+
+def is_number(value) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def is_array(value) -> bool:
+    return isinstance(value, list | tuple)
+
+
+def canonical(value, float_tolerance: float | None, unordered_arrays: bool):
+    if isinstance(value, dict):
+        return {str(key): canonical(child, float_tolerance, unordered_arrays) for key, child in value.items()}
+    if is_array(value):
+        elements = [canonical(child, float_tolerance, unordered_arrays) for child in value]
+        return sorted(elements, key=element_key) if unordered_arrays else elements
+    if float_tolerance and is_number(value):
+        return bucket(value, float_tolerance)
+    return value
+
+
+def bucket(value, float_tolerance: float):
+    try:
+        quotient = value / float_tolerance
+    except OverflowError:
+        return value
+    # Bucketing lets close numbers share a hash; values straddling a bucket edge still pair positionally.
+    # Values too large to bucket are compared exactly instead
+    return round(quotient) if math.isfinite(quotient) else value
+
+
+def element_key(value) -> str:
+    return json.dumps(value, default=datetime_or_default_handler, sort_keys=True)
+
+
+def match_unordered(left: list, right: list, float_tolerance: float | None) -> list:
+    positions = defaultdict(deque)
+    for index, element in enumerate(right):
+        positions[element_key(canonical(element, float_tolerance, True))].append(index)
+    paired = []
+    for element in left:
+        candidates = positions.get(element_key(canonical(element, float_tolerance, True)))
+        paired.append(candidates.popleft() if candidates else None)
+    used = set(paired)
+    leftovers = iter([index for index in range(len(right)) if index not in used])
+    # Unmatched right elements fill the gaps left by unmatched left ones so they line up as modifications
+    order = [next(leftovers, None) if index is None else index for index in paired]
+    return [right[index] for index in order if index is not None] + [right[index] for index in leftovers]
+
+
+def reconcile_arrays(left, right, float_tolerance: float | None, unordered_arrays: bool) -> list:
+    if unordered_arrays:
+        right = match_unordered(list(left), list(right), float_tolerance)
+    paired = [
+        reconcile(left_child, right_child, float_tolerance, unordered_arrays)
+        for left_child, right_child in zip(left, right, strict=False)
+    ]
+    return paired + list(right[len(paired) :])
+
+
+def reconcile(left, right, float_tolerance: float | None, unordered_arrays: bool):
+    if isinstance(left, dict) and isinstance(right, dict):
+        return {
+            key: reconcile(left[key], child, float_tolerance, unordered_arrays) if key in left else child
+            for key, child in right.items()
+        }
+    if is_array(left) and is_array(right):
+        return reconcile_arrays(left, right, float_tolerance, unordered_arrays)
+    if float_tolerance and is_number(left) and is_number(right) and abs(left - right) <= float_tolerance:
+        return left
+    return right
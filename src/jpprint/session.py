@@ -0,0 +1,180 @@
+import difflib
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from .core import needs_joint_pass, normalize_pair, set_options
+from .formatter import prepare
+from .layout import DocumentLayout, changed_window
+from .output import output_params, render_opcode
+from .paths import compile_path_filter
+from .width import text_width
+
+# Replacing rows[start:start + removed] with rows brings a caller's copy of session.rows up to date
+Patch = namedtuple('Patch', ('start', 'removed', 'rows'))
+
+
+def shift_block(block: tuple, side: int, delta: int) -> tuple:
+    tag, i1, i2, j1, j2 = block
+    if side == 0:
+        return tag, i1 + delta, i2 + delta, j1, j2
+    return tag, i1, i2, j1 + delta, j2 + delta
+
+
+def widest(lines: list) -> int:
+    return max(map(text_width, lines), default=0)
+
+
+class DiffSession:
+    def __init__(self, left, right, **options):
+        if options.get('show_ln'):
+            raise ValueError('DiffSession does not support show_ln: line numbers shift on every update')
+        if options.get('wrap'):
+            raise ValueError('DiffSession does not support wrap: rows are patched one source line at a time')
+        if not options.get('align_lines', True):
+            raise ValueError(
+                'DiffSession does not support align_lines=False: updates are re-aligned in place'
+            )
+        if options.get('max_bytes'):
+            raise ValueError('DiffSession does not support max_bytes: updates patch rows past any cut-off')
+        opts = set_options(options)
+        self._diff_only = opts.diff_only
+        self._joint = needs_joint_pass(options)
+        self._options = options
+        self._path_filter = compile_path_filter(opts.ignore_paths, opts.only_paths)
+        self._params = output_params(
+            opts.diff_ind, 0, 0, opts.separator, False, opts.use_box_chars, opts.use_colors
+        )
+        self._data = [prepare(left, self._path_filter), prepare(right, self._path_filter)]
+        self._layouts = [
+            DocumentLayout(data, opts.indent, opts.ensure_ascii, opts.max_width)
+            for data in self._normalized()
+        ]
+        self._lines = [layout.lines for layout in self._layouts]
+        self._realign()
+
+    @property
+    def rows(self) -> list[str]:
+        return [row for block_rows in self._rows for row in block_rows]
+
+    def update(self, left=None, right=None) -> Patch:
+        documents = (left, right)
+        for side, document in enumerate(documents):
+            if document is not None:
+                self._data[side] = prepare(document, self._path_filter)
+        fresh = self._format_sides([document is not None for document in documents])
+        changed = [side for side, lines in fresh.items() if lines != self._lines[side]]
+        if len(changed) == 2:
+            self._lines = [fresh[0], fresh[1]]
+            removed = self._row_count(0, len(self._rows))
+            return Patch(0, removed, self._realign())
+        if changed:
+            return self._update_side(changed[0], fresh[changed[0]])
+        return Patch(0, 0, [])
+
+    def _row_count(self, first: int, last: int) -> int:
+        return sum(map(len, self._rows[first:last]))
+
+    def _normalized(self) -> list:
+        if self._joint:
+            return list(normalize_pair(self._data[0], self._data[1], self._options))
+        return self._data
+
+    def _format_sides(self, recompute: list[bool]) -> dict[int, list[str]]:
+        # Normalizing and collapsing look at both sides, so either edit can change how the other renders
+        if self._joint:
+            recompute = [True, True]
+        data = self._normalized()
+        # Each layout re-serializes only the subtrees that changed since its previous version
+        return {side: self._layouts[side].update(data[side]) for side in (0, 1) if recompute[side]}
+
+    def _realign(self) -> list[str]:
+        matcher = difflib.SequenceMatcher(None, self._lines[0], self._lines[1])
+        self._blocks = matcher.get_opcodes()
+        self._params['l1width'] = widest(self._lines[0])
+        self._params['l2width'] = widest(self._lines[1])
+        self._rows = [self._render(block) for block in self._blocks]
+        return self.rows
+
+    def _render(self, block: tuple) -> list[str]:
+        return list(render_opcode(block, self._lines[0], self._lines[1], self._params, self._diff_only))
+
+    def _update_side(self, side: int, new_lines: list) -> Patch:
+        old_lines = self._lines[side]
+        lo, old_hi, new_hi = changed_window(old_lines, new_lines)
+        if lo == old_hi == new_hi:
+            return Patch(0, 0, [])
+        self._lines[side] = new_lines
+        width_key = ('l1width', 'l2width')[side]
+        width = self._params[width_key]
+        new_width = max(width, widest(new_lines[lo:new_hi]))
+        # Only a removed line at full width can shrink the column, so the full rescan is rare
+        if widest(old_lines[lo:old_hi]) >= width:
+            new_width = widest(new_lines)
+        patch = self._splice_blocks(side, lo, old_hi, new_hi - old_hi)
+        if new_width != width:
+            removed = self._row_count(0, len(self._rows)) - len(patch.rows) + patch.removed
+            self._params[width_key] = new_width
+            self._rows = [self._render(block) for block in self._blocks]
+            return Patch(0, removed, self.rows)
+        return patch
+
+    def _split_equal_block(self, side: int, position: int):
+        start = 1 + 2 * side
+        index = bisect_right(self._blocks, position, key=lambda block: block[start + 1])
+        if index == len(self._blocks):
+            return
+        tag, i1, i2, j1, j2 = self._blocks[index]
+        offset = position - self._blocks[index][start]
+        if tag != 'equal' or offset <= 0:
+            return
+        self._blocks[index : index + 1] = [
+            (tag, i1, i1 + offset, j1, j1 + offset),
+            (tag, i1 + offset, i2, j1 + offset, j2),
+        ]
+        rows = self._rows[index]
+        self._rows[index : index + 1] = [rows[:offset], rows[offset:]]
+
+    def _affected_blocks(self, side: int, lo: int, hi: int) -> tuple[int, int]:
+        # Equal runs are split at the edit so only the touched lines are re-diffed
+        self._split_equal_block(side, lo)
+        self._split_equal_block(side, hi)
+        start = 1 + 2 * side
+        first = bisect_right(self._blocks, lo, key=lambda block: block[start + 1])
+        last = max(bisect_left(self._blocks, hi, key=lambda block: block[start]), first)
+        # Neighbouring non-equal blocks are pulled in so adjacent changes pair up as one replace
+        if first > 0 and self._blocks[first - 1][0] != 'equal':
+            first -= 1
+        if last < len(self._blocks) and self._blocks[last][0] != 'equal':
+            last += 1
+        return first, last
+
+    def _region(self, first: int, last: int) -> list[int]:
+        if first < last:
+            return [
+                self._blocks[first][1],
+                self._blocks[last - 1][2],
+                self._blocks[first][3],
+                self._blocks[last - 1][4],
+            ]
+        if first < len(self._blocks):
+            _, i1, _, j1, _ = self._blocks[first]
+            return [i1, i1, j1, j1]
+        _, _, i2, _, j2 = self._blocks[-1]
+        return [i2, i2, j2, j2]
+
+    def _splice_blocks(self, side: int, lo: int, hi: int, delta: int) -> Patch:
+        first, last = self._affected_blocks(side, lo, hi)
+        start = self._row_count(0, first)
+        removed = self._row_count(first, last)
+        l_lo, l_hi, r_lo, r_hi = self._region(first, last)
+        l_hi += delta if side == 0 else 0
+        r_hi += delta if side == 1 else 0
+        matcher = difflib.SequenceMatcher(None, self._lines[0][l_lo:l_hi], self._lines[1][r_lo:r_hi])
+        new_blocks = [
+            (tag, i1 + l_lo, i2 + l_lo, j1 + r_lo, j2 + r_lo) for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        ]
+        tail = [shift_block(block, side, delta) for block in self._blocks[last:]]
+        self._blocks[first:] = new_blocks + tail
+        new_rows = [self._render(block) for block in new_blocks]
+        self._rows[first:last] = new_rows
+        return Patch(start, removed, [row for block_rows in new_rows for row in block_rows])
@@ -0,0 +1,165 @@
+import codecs
+import contextlib
+import io
+import os
+import sys
+from abc import ABC, abstractmethod
+
+
+class Sink(ABC):
+    @abstractmethod
+    def write(self, chunk: str):
+        pass
+
+    def close(self):  # noqa: B027 - optional hook, most sinks have nothing to release
+        pass
+
+
+class ChunkEncoder:
+    # One incremental encoder per sink, so encodings with a BOM or other state write it only once
+    def __init__(self):
+        self.encoder = None
+        self.encoding = None
+
+    def encode(self, chunk: str, encoding: str) -> bytes:
+        if encoding != self.encoding:
+            self.encoder = codecs.getincrementalencoder(encoding)()
+            self.encoding = encoding
+        return self.encoder.encode(chunk)
+
+    def finish(self) -> bytes:
+        return self.encoder.encode('', final=True) if self.encoder else b''
+
+
+class StreamSink(Sink):
+    def __init__(self, stream=None, encoding: str | None = None):
+        self.encoder = ChunkEncoder()
+        self.encoding = encoding
+        self.stream = stream
+
+    def write(self, chunk: str):
+        # Looked up per write so redirect_stdout and similar swaps are honoured
+        stream = self.stream or sys.stdout
+        if isinstance(stream, io.RawIOBase | io.BufferedIOBase):
+            stream.write(self.encoder.encode(chunk, self.encoding or 'utf-8'))
+        elif hasattr(stream, 'buffer'):
+            stream.flush()
+            stream.buffer.write(self.encoder.encode(chunk, self.encoding or stream.encoding or 'utf-8'))
+        else:
+            stream.write(chunk)
+
+    def close(self):
+        stream = self.stream or sys.stdout
+        tail = self.encoder.finish()
+        if isinstance(stream, io.RawIOBase | io.BufferedIOBase):
+            stream.write(tail)
+        elif hasattr(stream, 'buffer'):
+            stream.buffer.write(tail)
+            stream.buffer.flush()
+        stream.flush()
+
+
+class FileSink(StreamSink):
+    def __init__(self, path: str | os.PathLike, encoding: str = 'utf-8'):
+        super().__init__(open(path, 'wb'), encoding)  # noqa: SIM115 - closed in close()
+
+    def close(self):
+        super().close()
+        self.stream.close()
+
+
+class PagerSink(Sink):
+    def __init__(self, command: str | None = None, encoding: str = 'utf-8'):
+        # Deferred because subprocess is slow to import and only the pager needs it
+        import shlex
+        import subprocess
+
+        command = command or os.environ.get('PAGER') or 'less -R'
+        self.encoder = ChunkEncoder()
+        self.encoding = encoding
+        self.process = subprocess.Popen(shlex.split(command), stdin=subprocess.PIPE)
+        self.closed = False
+
+    def write(self, chunk: str):
+        if self.closed:
+            return
+        try:
+            self.process.stdin.write(self.encoder.encode(chunk, self.encoding))
+        except BrokenPipeError:
+            # The user quit the pager early; the rest of the diff has nowhere to go
+            self.closed = True
+
+    def close(self):
+        with contextlib.suppress(BrokenPipeError):
+            if not self.closed:
+                self.process.stdin.write(self.encoder.finish())
+            self.process.stdin.close()
+        self.process.wait()
+
+
+class MemorySink(Sink):
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, chunk: str):
+        self.chunks.append(chunk)
+
+    def getvalue(self) -> str:
+        return ''.join(self.chunks)
+
+
+class CallbackSink(Sink):
+    def __init__(self, callback):
+        self.callback = callback
+
+    def write(self, chunk: str):
+        self.callback(chunk)
+
+
+class ChunkedWriter:
+    def __init__(self, sink: Sink, chunk_size: int):
+        self.sink = sink
+        self.chunk_size = chunk_size
+        self.buffer = []
+        self.size = 0
+
+    def write(self, text: str):
+        if len(text) >= self.chunk_size:
+            self.write_large(text)
+            return
+        self.buffer.append(text)
+        self.size += len(text)
+        if self.size >= self.chunk_size:
+            self.flush()
+
+    def write_large(self, text: str):
+        self.flush()
+        for start in range(0, len(text), self.chunk_size):
+            self.sink.write(text[start : start + self.chunk_size])
+
+    def flush(self):
+        if self.buffer:
+            self.sink.write(''.join(self.buffer))
+            self.buffer = []
+            self.size = 0
+
+
+def emit_lines(lines, sink: Sink | None, chunk_size: int):
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size must be at least 1, got {chunk_size}')
+    sink = sink or StreamSink()
+    if not isinstance(sink, Sink):
+        raise TypeError(f'sink must be a jpprint Sink, got {type(sink).__name__}')
+    writer = ChunkedWriter(sink, chunk_size)
+    try:
+        empty = True
+        for line in lines:
+            writer.write(line)
+            writer.write('\n')
+            empty = False
+        # Matches print('\n'.join(lines)), which emits a bare newline for no lines
+        if empty:
+            writer.write('\n')
+        writer.flush()
+    finally:
+        sink.close()
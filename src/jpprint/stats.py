@@ -0,0 +1,46 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+DONE = object()
+
+
+class DiffStats:
+    def __init__(self):
+        self.bytes_emitted = 0
+        self.left_lines = 0
+        self.opcodes = Counter()
+        self.replace_blocks: list[tuple[int, int]] = []
+        self.right_lines = 0
+        self.rows = 0
+        self.stage_seconds: dict[str, float] = {}
+        self._inner_seconds: list[float] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        # Stages pull rows from each other lazily, so time spent in a nested stage is charged to it alone
+        start = time.perf_counter()
+        self._inner_seconds.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            own = elapsed - self._inner_seconds.pop()
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + own
+            if self._inner_seconds:
+                self._inner_seconds[-1] += elapsed
+
+    def timed(self, rows, name: str):
+        iterator = iter(rows)
+        while True:
+            with self.stage(name):
+                row = next(iterator, DONE)
+            if row is DONE:
+                return
+            yield row
+
+    def record_opcode(self, opcode: tuple):
+        tag, i1, i2, j1, j2 = opcode
+        self.opcodes[tag] += 1
+        if tag == 'replace':
+            self.replace_blocks.append((i2 - i1, j2 - j1))
@@ -0,0 +1,170 @@
+import difflib
+from itertools import zip_longest
+
+from .colors import DiffType, apply_line_color, classify_diff_type
+from .core import set_options
+from .formatter import dump, prepare
+from .lines import Lines
+from .output import aligned_rows, limit_bytes, row_delimiter
+from .paths import compile_path_filter
+from .semantic import reconcile
+from .sinks import emit_lines
+from .width import pad
+
+EQUAL_ROW = (DiffType.EQUAL, DiffType.EQUAL)
+CONFLICT_ROW = (DiffType.CONFLICT, DiffType.CONFLICT)
+
+
+def format_triple(base, left, right, options: dict) -> tuple[Lines, Lines, Lines]:
+    opts = set_options(options)
+    path_filter = compile_path_filter(opts.ignore_paths, opts.only_paths)
+    base, left, right = (prepare(document, path_filter) for document in (base, left, right))
+    # Both sides are reconciled against the base, so tolerated noise never shows up as a conflict
+    if opts.float_tolerance or opts.unordered_arrays:
+        left = reconcile(base, left, opts.float_tolerance, opts.unordered_arrays)
+        right = reconcile(base, right, opts.float_tolerance, opts.unordered_arrays)
+    documents = tuple(
+        Lines(dump(document, opts.indent, opts.ensure_ascii)) for document in (base, left, right)
+    )
+    if opts.max_width:
+        for lines in documents:
+            lines.truncate(opts.max_width)
+    return documents
+
+
+def matched_lines(base_lines: list, side_lines: list) -> dict:
+    if base_lines == side_lines:
+        return dict(zip(range(len(base_lines)), range(len(side_lines)), strict=True))
+    matcher = difflib.SequenceMatcher(None, base_lines, side_lines)
+    matches = {}
+    for base_start, side_start, size in matcher.get_matching_blocks():
+        matches.update(
+            zip(range(base_start, base_start + size), range(side_start, side_start + size), strict=True)
+        )
+    return matches
+
+
+def merge_regions(base_lines: list, left_lines: list, right_lines: list):
+    """Yield (stable, base, left, right) slice bounds, splitting at base lines both sides kept."""
+    left_matches = matched_lines(base_lines, left_lines)
+    right_matches = matched_lines(base_lines, right_lines)
+    ends = (len(base_lines), len(left_lines), len(right_lines))
+    at = (0, 0, 0)
+    run_start = None
+    for index in [*(index for index in left_matches if index in right_matches), ends[0]]:
+        anchor = (index, left_matches.get(index, ends[1]), right_matches.get(index, ends[2]))
+        if anchor != at:
+            if run_start:
+                yield True, *interleave(run_start, at)
+            yield False, *interleave(at, anchor)
+            run_start = None
+        run_start = run_start or anchor
+        at = tuple(position + 1 for position in anchor)
+    if run_start and run_start[0] < ends[0]:
+        yield True, *interleave(run_start, ends)
+
+
+def interleave(starts: tuple, stops: tuple) -> tuple:
+    return tuple(bound for pair in zip(starts, stops, strict=True) for bound in pair)
+
+
+def one_sided_rows(base: list, side: list, changed_left: bool):
+    for base_text, side_text, diff_type in aligned_rows(base, side):
+        if changed_left:
+            yield side_text, base_text, base_text, diff_type, DiffType.EQUAL
+        else:
+            yield base_text, base_text, side_text, DiffType.EQUAL, diff_type
+
+
+def changed_region_rows(base: list, left: list, right: list):
+    if left == base or right == base:
+        yield from one_sided_rows(base, right if left == base else left, changed_left=right == base)
+    elif left == right:
+        for base_text, side_text, diff_type in aligned_rows(base, left):
+            yield side_text, base_text, side_text, diff_type, diff_type
+    else:
+        for left_text, base_text, right_text in zip_longest(left, base, right, fillvalue=''):
+            yield left_text, base_text, right_text, *CONFLICT_ROW
+
+
+def aligned_rows3(base_lines: list, left_lines: list, right_lines: list):
+    for stable, base_start, base_end, left_start, left_end, right_start, right_end in merge_regions(
+        base_lines, left_lines, right_lines
+    ):
+        base = base_lines[base_start:base_end]
+        if stable:
+            for base_text in base:
+                yield base_text, base_text, base_text, *EQUAL_ROW
+            continue
+        yield from changed_region_rows(
+            base, left_lines[left_start:left_end], right_lines[right_start:right_end]
+        )
+
+
+def zipped_rows3(base_lines: list, left_lines: list, right_lines: list):
+    for left_text, base_text, right_text in zip_longest(left_lines, base_lines, right_lines, fillvalue=' '):
+        left_type = classify_diff_type(base_text, left_text, fillvalue=' ')
+        right_type = classify_diff_type(base_text, right_text, fillvalue=' ')
+        if DiffType.EQUAL not in (left_type, right_type) and left_text != right_text:
+            left_type = right_type = DiffType.CONFLICT
+        yield left_text, base_text, right_text, left_type, right_type
+
+
+def base_diff_type(left_type: DiffType, right_type: DiffType) -> DiffType:
+    return left_type if left_type != DiffType.EQUAL else right_type
+
+
+def format_merge_line(
+    row: tuple,
+    delims: dict,
+    widths: tuple,
+    line_no: int,
+    show_ln: bool,
+    use_colors: bool,
+) -> str:
+    left_text, base_text, right_text, left_type, right_type = row
+    left_width, base_width, right_width = widths
+    left_cell = apply_line_color(pad(left_text, left_width), left_type, is_left=False, use_colors=use_colors)
+    base_cell = apply_line_color(
+        pad(base_text, base_width),
+        base_diff_type(left_type, right_type),
+        is_left=True,
+        use_colors=use_colors,
+    )
+    right_cell = apply_line_color(
+        pad(right_text, right_width), right_type, is_left=False, use_colors=use_colors
+    )
+    return '{}{}{:^10}{}{:^10}{}'.format(
+        line_no if show_ln else '', left_cell, delims[left_type], base_cell, delims[right_type], right_cell
+    )
+
+
+def merge_output(base: Lines, left: Lines, right: Lines, options: dict):
+    opts = set_options(options)
+    delims = {
+        diff_type: row_delimiter(diff_type, opts.diff_ind, opts.separator, opts.use_box_chars)
+        for diff_type in DiffType
+    }
+    widths = (left.width, base.width, right.width)
+    row_source = aligned_rows3 if opts.align_lines else zipped_rows3
+    rows = row_source(base.lines, left.lines, right.lines)
+    for line_no, row in enumerate(rows, 1):
+        if opts.diff_only and row[3:] == EQUAL_ROW:
+            continue
+        yield format_merge_line(row, delims, widths, line_no, opts.show_ln, opts.use_colors)
+
+
+def jpprint3(base, left, right, **options):
+    """Print left, base and right side by side, marking lines both sides changed differently as conflicts."""
+    for name in ('collapse_equal_subtrees', 'stats', 'wrap'):
+        if options.get(name):
+            raise ValueError(f'jpprint3 does not support {name}')
+    # Summarizing each document on its own would hide conflicts below the depth limit
+    if options.get('max_depth') is not None:
+        raise ValueError('jpprint3 does not support max_depth')
+    opts = set_options(options)
+    rows = merge_output(*format_triple(base, left, right, options), options)
+    rows = limit_bytes(rows, opts.max_bytes) if opts.max_bytes else rows
+    if opts.retr:
+        return list(rows)
+    emit_lines(rows, opts.sink, opts.chunk_size)
@@ -0,0 +1,56 @@
+from bisect import bisect_right
+from functools import cache
+from itertools import accumulate
+
+ZERO_WIDTH_CATEGORIES = {'Cf', 'Me', 'Mn'}
+WIDE = {'F', 'W'}
+
+
+@cache
+def char_width(char: str) -> int:
+    # Imported here so ASCII-only callers never load the Unicode database
+    import unicodedata
+
+    if unicodedata.category(char) in ZERO_WIDTH_CATEGORIES:
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in WIDE else 1
+
+
+def text_width(text: str) -> int:
+    # isascii() is a single C pass, so ASCII lines never reach the per-character lookup
+    if text.isascii():
+        return len(text)
+    return sum(map(char_width, text))
+
+
+def document_width(text: str) -> int:
+    lines = text.split('\n')
+    if text.isascii():
+        return max(map(len, lines))
+    return max(map(text_width, lines))
+
+
+def pad(text: str, width: int) -> str:
+    if text.isascii():
+        return text.ljust(width)
+    return text + ' ' * (width - text_width(text))
+
+
+def clip(text: str, width: int) -> str:
+    """Cut text to at most width columns, never splitting a wide character."""
+    return text[: bisect_right(list(accumulate(map(char_width, text))), width)]
+
+
+def split_width(text: str, width: int) -> list[str]:
+    """Split text into pieces of at most width columns; an empty line stays one empty piece."""
+    if text.isascii():
+        return [text[start : start + width] for start in range(0, len(text), width)] or ['']
+    ends = list(accumulate(map(char_width, text)))
+    pieces = []
+    start = 0
+    while start < len(text):
+        # A character wider than the column still advances, so the loop always terminates
+        stop = max(bisect_right(ends, (ends[start - 1] if start else 0) + width), start + 1)
+        pieces.append(text[start:stop])
+        start = stop
+    return pieces or ['']
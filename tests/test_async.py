@@ -0,0 +1,40 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from jpprint import adiff, adiff_rows, jpprint
+
+from . import BaseTestCase
+
+OPTIONS = {'use_box_chars': False, 'use_colors': False}
+
+
+async def collect(rows):
+    return [row async for row in rows]
+
+
+class AsyncTests(BaseTestCase):
+    def test_adiff_matches_jpprint(self):
+        a = {'a': 'b', 'c': 'd'}
+        b = {'a': 'b', 'c': 'e', 'f': 'g'}
+        output = asyncio.run(adiff(a, b, **OPTIONS))
+        self.assertEqual(jpprint(a, b, retr=True, **OPTIONS), output)
+
+    def test_adiff_rows_streams_in_chunks(self):
+        a = {f'key{n}': n for n in range(50)}
+        b = {f'key{n}': n + 1 for n in range(50)}
+        output = asyncio.run(collect(adiff_rows(a, b, chunk_size=7, **OPTIONS)))
+        self.assertEqual(jpprint(a, b, retr=True, **OPTIONS), output)
+
+    def test_adiff_uses_given_executor(self):
+        a = {'a': 'b'}
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            output = asyncio.run(adiff(a, a, executor=executor, **OPTIONS))
+        self.assertEqual(jpprint(a, a, retr=True, **OPTIONS), output)
+
+    def test_adiff_rejects_process_executors(self):
+        with ProcessPoolExecutor(max_workers=1) as executor, self.assertRaises(TypeError):
+            asyncio.run(adiff({'a': 1}, {'a': 2}, executor=executor))
+
+    def test_adiff_rejects_empty_chunks(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(adiff({}, {}, chunk_size=0))
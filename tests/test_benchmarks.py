@@ -0,0 +1,39 @@
+from benchmarks.suite import STAGES, find_regressions, run_suite
+
+from . import BaseTestCase
+
+
+def results(seconds: float, peak_bytes: int) -> dict:
+    return {'cases': {'case': {'stages': {'align': {'peak_bytes': peak_bytes, 'seconds': seconds}}}}}
+
+
+class BenchmarkTests(BaseTestCase):
+    def test_suite_reports_every_stage(self):
+        output = run_suite(['deep_nesting'], repeats=1)
+        stages = output['cases']['deep_nesting']['stages']
+        self.assertEqual(list(STAGES), list(stages))
+        self.assertTrue(all(stats['seconds'] >= 0 for stats in stages.values()))
+        self.assertTrue(all('retained_blocks' in stats for stats in stages.values()))
+
+    def test_unknown_case_is_rejected(self):
+        with self.assertRaises(ValueError):
+            run_suite(['missing'], repeats=1)
+
+    def test_slowdown_beyond_threshold_is_a_regression(self):
+        regressions = find_regressions(results(0.1, 0), results(0.2, 0), threshold=0.25)
+        self.assertEqual(['case/align: time 0.1000s -> 0.2000s'], regressions)
+
+    def test_small_changes_are_not_regressions(self):
+        self.assertEqual([], find_regressions(results(0.1, 10**6), results(0.11, 10**6), threshold=0.25))
+        self.assertEqual([], find_regressions(results(0.0001, 0), results(0.0005, 0), threshold=0.25))
+
+    def test_memory_growth_is_a_regression(self):
+        regressions = find_regressions(results(0.1, 10**6), results(0.1, 2 * 10**6), threshold=0.25)
+        self.assertEqual(1, len(regressions))
+
+    def test_block_growth_is_a_regression(self):
+        baseline = results(0.1, 0)
+        current = results(0.1, 0)
+        baseline['cases']['case']['stages']['align']['retained_blocks'] = 10000
+        current['cases']['case']['stages']['align']['retained_blocks'] = 30000
+        self.assertEqual(['case/align: blocks 10,000 -> 30,000'], find_regressions(baseline, current, 0.25))
@@ -0,0 +1,79 @@
+from contextlib import redirect_stdout
+from io import StringIO
+
+from jpprint import DiffSession, jpprint
+
+from . import BaseTestCase
+
+OPTIONS = {'retr': True, 'use_box_chars': False, 'use_colors': False}
+
+
+class CollapseTests(BaseTestCase):
+    def test_max_depth_summarizes_deeper_containers(self):
+        a = {'a': {'b': {'c': 1, 'd': 2}, 'e': [1, 2, 3]}}
+        output = jpprint(a, a, max_depth=1, **OPTIONS)
+        lines = '\n'.join(output)
+        self.assertIn('"b": {… 2 keys},', lines)
+        self.assertIn('"e": [… 3 items]', lines)
+
+    def test_single_key_and_item_are_singular(self):
+        a = {'a': {'b': {'c': 1}, 'd': [1]}}
+        lines = '\n'.join(jpprint(a, a, max_depth=1, **OPTIONS))
+        self.assertIn('{… 1 key}', lines)
+        self.assertIn('[… 1 item]', lines)
+
+    def test_collapse_equal_subtrees_keeps_path_to_change_expanded(self):
+        a = {'same': {'x': 1, 'y': 2}, 'changed': {'deep': {'value': 1}, 'other': {'k': 1}}}
+        b = {'same': {'x': 1, 'y': 2}, 'changed': {'deep': {'value': 2}, 'other': {'k': 1}}}
+        lines = '\n'.join(jpprint(a, b, collapse_equal_subtrees=True, **OPTIONS))
+        self.assertIn('"same": {… 2 keys}', lines)
+        self.assertIn('"other": {… 1 key}', lines)
+        self.assertIn('"value": 1', lines)
+        self.assertIn('"value": 2', lines)
+
+    def test_max_depth_limits_which_equal_subtrees_collapse(self):
+        a = {'same': {'inner': {'x': 1}}, 'v': 1}
+        b = {'same': {'inner': {'x': 1}}, 'v': 2}
+        lines = '\n'.join(jpprint(a, b, collapse_equal_subtrees=True, max_depth=1, **OPTIONS))
+        self.assertIn('"inner": {… 1 key}', lines)
+        self.assertNotIn('"same": {…', lines)
+
+    def test_max_depth_implies_collapse_equal_subtrees(self):
+        a = {'same': {'inner': {'x': 1}}, 'v': {'w': {'x': 1}}}
+        b = {'same': {'inner': {'x': 1}}, 'v': {'w': {'x': 2}}}
+        self.assertEqual(
+            jpprint(a, b, max_depth=1, **OPTIONS),
+            jpprint(a, b, collapse_equal_subtrees=True, max_depth=1, **OPTIONS),
+        )
+
+    def test_max_depth_keeps_changes_below_it_expanded(self):
+        a = {'a': {'b': {'c': 1}}, 'same': {'inner': {'x': 1}}}
+        b = {'a': {'b': {'c': 2}}, 'same': {'inner': {'x': 1}}}
+        output = jpprint(a, b, max_depth=1, diff_only=True, **OPTIONS)
+        self.assertEqual(1, len(output))
+        self.assertIn('"c": 1', output[0])
+        self.assertIn('"c": 2', output[0])
+        self.assertIn('"inner": {… 1 key}', '\n'.join(jpprint(a, b, max_depth=1, **OPTIONS)))
+
+    def test_one_sided_subtrees_follow_max_depth(self):
+        a = {'a': 1}
+        b = {'a': 1, 'new': {'deep': {'x': 1}}}
+        lines = '\n'.join(jpprint(a, b, max_depth=1, **OPTIONS))
+        self.assertIn('"deep": {… 1 key}', lines)
+
+    def test_root_is_never_collapsed(self):
+        a = {'a': 1}
+        output = jpprint(a, a, collapse_equal_subtrees=True, **OPTIONS)
+        self.assertEqual(jpprint(a, a, **OPTIONS), output)
+
+    def test_single_document_respects_max_depth(self):
+        out = StringIO()
+        with redirect_stdout(out):
+            jpprint({'a': {'b': {'c': 1}}}, max_depth=1)
+        self.assertIn('"b": {… 1 key}', out.getvalue())
+
+    def test_session_collapses_equal_subtrees(self):
+        a = {'same': {'x': 1}, 'v': 1}
+        session = DiffSession(a, a, collapse_equal_subtrees=True, use_colors=False)
+        session.update(right={'same': {'x': 1}, 'v': 2})
+        self.assertIn('"same": {… 1 key},', '\n'.join(session.rows))
@@ -0,0 +1,63 @@
+from jpprint import html_diff
+
+from . import BaseTestCase
+
+
+def render(*args, **options) -> str:
+    return ''.join(html_diff(*args, **options))
+
+
+class HtmlTests(BaseTestCase):
+    def test_rows_are_classed_by_diff_type(self):
+        output = render({'a': 'b', 'c': 'd'}, {'a': 'x', 'e': 'f'})
+        self.assertIn('<tr class="modified">', output)
+        self.assertIn('<tr class="equal">', output)
+
+    def test_added_and_deleted_rows(self):
+        output = render({'a': 1}, {'a': 1, 'b': 2}, use_box_chars=False)
+        self.assertIn('<tr class="added"><td class="left"></td><td class="delim"><></td>', output)
+        output = render({'a': 1, 'b': 2}, {'a': 1})
+        self.assertIn('<tr class="deleted">', output)
+
+    def test_values_are_escaped(self):
+        output = render({'a': '<script>'}, {'a': '<b>'})
+        self.assertIn('&lt;script&gt;', output)
+        self.assertNotIn('"<b>"', output)
+
+    def test_long_equal_runs_are_collapsed_into_templates(self):
+        a = {f'key{n:03}': n for n in range(200)}
+        b = dict(a, key100=-1)
+        output = render(a, b, collapse_after=20, context=2)
+        self.assertEqual(2, output.count('<template'))
+        self.assertIn('jpExpand(1)', output)
+        self.assertIn('97 equal lines', output)
+
+    def test_collapsed_rows_can_be_dropped(self):
+        a = {f'key{n:03}': n for n in range(200)}
+        b = dict(a, key100=-1)
+        output = render(a, b, collapse_after=20, context=2, keep_collapsed=False)
+        self.assertNotIn('<template', output)
+        self.assertNotIn('"key050"', output)
+        self.assertIn('97 equal lines', output)
+
+    def test_short_equal_runs_are_not_collapsed(self):
+        output = render({'a': 1, 'b': 2}, {'a': 1, 'b': 3})
+        self.assertNotIn('collapsed" id=', output)
+
+    def test_output_streams_in_chunks(self):
+        a = {f'key{n:03}': n for n in range(200)}
+        chunks = list(html_diff(a, {}, chunk_size=1024))
+        self.assertGreater(len(chunks), 5)
+        self.assertTrue(chunks[-1].endswith('</html>\n'))
+
+    def test_show_ln_adds_number_column(self):
+        output = render({'a': 1}, {'a': 2}, show_ln=True)
+        self.assertIn('<td class="ln">2</td>', output)
+
+    def test_diff_only_skips_equal_rows(self):
+        output = render({'a': 1, 'b': 2}, {'a': 1, 'b': 3}, diff_only=True)
+        self.assertNotIn('<tr class="equal">', output)
+
+    def test_context_must_fit_within_collapse_threshold(self):
+        with self.assertRaises(ValueError):
+            render({}, {}, collapse_after=4, context=3)
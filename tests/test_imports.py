@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+
+import jpprint
+from benchmarks.suite import find_regressions, measure_import_times
+
+from . import BaseTestCase
+
+
+def loaded_modules(statement: str) -> set:
+    script = f'{statement}\nimport sys\nprint(" ".join(sys.modules))'
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        capture_output=True,
+        check=True,
+        env={'PYTHONPATH': os.pathsep.join(filter(None, sys.path))},
+        text=True,
+    )
+    return set(result.stdout.split())
+
+
+class ImportTests(BaseTestCase):
+    def test_package_import_loads_no_submodules(self):
+        modules = loaded_modules('import jpprint')
+        self.assertEqual(set(), {name for name in modules if name.startswith('jpprint.')})
+        self.assertNotIn('asyncio', modules)
+        self.assertNotIn('difflib', modules)
+
+    def test_core_import_skips_optional_stdlib_modules(self):
+        modules = loaded_modules('from jpprint import jpprint')
+        self.assertEqual(set(), {'asyncio', 'html', 'subprocess', 'unicodedata'} & modules)
+
+    def test_json_encoder_is_not_patched(self):
+        from jpprint import formatter  # noqa: F401
+
+        self.assertEqual('json.encoder', json.JSONEncoder.default.__module__)
+
+    def test_exports_resolve_lazily(self):
+        self.assertIn('jpprint', dir(jpprint))
+        self.assertTrue(callable(jpprint.html_diff))
+        with self.assertRaises(AttributeError):
+            jpprint.missing  # noqa: B018
+
+    def test_import_times_are_measured(self):
+        times = measure_import_times(repeats=1)
+        self.assertEqual({'package', 'jpprint'}, set(times))
+        self.assertTrue(all(seconds >= 0 for seconds in times.values()))
+        # Loading the modules behind jpprint() costs far more than the package itself
+        self.assertGreater(times['jpprint'], times['package'])
+
+    def test_slower_import_is_a_regression(self):
+        baseline = {'cases': {}, 'imports': {'package': 0.01}}
+        current = {'cases': {}, 'imports': {'package': 0.05}}
+        self.assertEqual(
+            ['import/package: time 0.0100s -> 0.0500s'], find_regressions(baseline, current, 0.25)
+        )
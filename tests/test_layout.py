@@ -0,0 +1,41 @@
+from jpprint.formatter import dump
+from jpprint.layout import DocumentLayout
+
+from . import BaseTestCase
+
+
+class DocumentLayoutTests(BaseTestCase):
+    def assert_patched(self, old, new, indent=4):
+        layout = DocumentLayout(old, indent, True, None)
+        self.assertEqual(dump(new, indent).split('\n'), layout.update(new))
+
+    def test_nested_edit_matches_full_dump(self):
+        self.assert_patched({'a': {'b': [1, 2, 3]}, 'c': 1}, {'a': {'b': [1, 5, 3]}, 'c': 1})
+
+    def test_added_and_removed_entries_move_the_trailing_comma(self):
+        self.assert_patched({'a': 1, 'b': [1, 2]}, {'a': 1, 'b': [1, 2, 3], 'c': 2})
+        self.assert_patched({'a': 1, 'b': [1, 2, 3], 'c': 2}, {'a': 1, 'b': [2, 3]})
+
+    def test_values_equal_under_eq_are_still_reserialized(self):
+        self.assert_patched({'a': [1, 0.0]}, {'a': [True, -0.0]})
+
+    def test_non_string_keys_replace_the_object_whole(self):
+        self.assert_patched({'a': {2: 'x', 10: 'y'}}, {'a': {2: 'x', 10: 'z'}})
+
+    def test_unchanged_lines_are_not_rebuilt(self):
+        old = {f'key{n}': {'value': n} for n in range(10)}
+        layout = DocumentLayout(old, 2, True, None)
+        before = layout.lines
+        after = layout.update({**old, 'key5': {'value': -1}})
+        self.assertIs(before[1], after[1])
+        self.assertEqual(dump({**old, 'key5': {'value': -1}}, 2).split('\n'), after)
+
+    def test_data_mutated_in_place_is_detected(self):
+        data = {'a': {'b': 1}}
+        layout = DocumentLayout(data, 2, True, None)
+        data['a']['b'] = 2
+        self.assertEqual(dump(data, 2).split('\n'), layout.update(data))
+
+    def test_patched_lines_are_truncated(self):
+        layout = DocumentLayout({'a': 'x'}, 2, True, 10)
+        self.assertEqual(['{', '  "a": ...', '}'], layout.update({'a': 'y' * 20}))
@@ -0,0 +1,36 @@
+from jpprint.core import format_lines
+from jpprint.lines import Lines
+
+from . import BaseTestCase
+
+
+class LinesTests(BaseTestCase):
+    def test_text_is_split_once_with_width(self):
+        lines = Lines('{\n    "a": 1\n}')
+        self.assertEqual(['{', '    "a": 1', '}'], lines.lines)
+        self.assertTrue(lines.ascii)
+        self.assertEqual(10, lines.width)
+
+    def test_empty_text_has_no_lines(self):
+        self.assertEqual([], Lines('').lines)
+        self.assertEqual(0, Lines('').width)
+
+    def test_truncate_keeps_short_lines_and_updates_width(self):
+        lines = Lines('short\n' + 'x' * 20)
+        short = lines.lines[0]
+        lines.truncate(10)
+        self.assertIs(short, lines.lines[0])
+        self.assertEqual('xxxxxxx...', lines.lines[1])
+        self.assertEqual(10, lines.width)
+
+    def test_wide_text_uses_display_width(self):
+        lines = Lines('山田太郎\nab')
+        self.assertFalse(lines.ascii)
+        self.assertEqual(8, lines.width)
+        lines.truncate(6)
+        self.assertEqual('山...', lines.lines[0])
+
+    def test_format_lines_matches_text_round_trip(self):
+        left, right = format_lines({'a': 1}, {'a': 2}, {'max_width': 10})
+        self.assertEqual('{\n    "a": 1\n}', left.text())
+        self.assertEqual(['{', '    "a": 2', '}'], right.lines)
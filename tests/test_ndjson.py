@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import count, islice
+
+from jpprint import MemorySink, jpprint_ndjson, ndjson_rows, strip_color
+
+from . import BaseTestCase
+
+LEFT = ['{"id": 1, "v": 1}', '{"id": 2, "v": 2}', '', '{"id": 3, "v": 3}']
+RIGHT = ['{"id": 2, "v": 2}', '{"id": 1, "v": 5}', '{"id": 4, "v": 4}']
+
+
+def rows(*args, **options) -> list[str]:
+    return [strip_color(row) for row in ndjson_rows(*args, **options)]
+
+
+def headers(output: list) -> list[str]:
+    return [row for row in output if row.startswith('@@')]
+
+
+class NdjsonTests(BaseTestCase):
+    def test_records_pair_by_position(self):
+        output = rows(LEFT, RIGHT)
+        self.assertEqual(['@@ record 1 @@', '@@ record 2 @@', '@@ record 3 @@'], headers(output))
+
+    def test_records_pair_by_key(self):
+        output = rows(LEFT, RIGHT, key='id', diff_only=True)
+        self.assertEqual(['@@ id=1 @@', '@@ id=3 @@', '@@ id=4 @@'], headers(output))
+        self.assertIn('"v": 5', output[1])
+
+    def test_key_can_be_callable(self):
+        output = rows(LEFT, RIGHT, key=lambda record: record['id'] % 2, diff_only=True)
+        self.assertIn('@@ <lambda>=1 @@', output)
+
+    def test_unmatched_records_are_one_sided(self):
+        output = rows(LEFT[:1], [], use_box_chars=False)
+        self.assertEqual(['@@ record 1 @@', '{               <>    '], output[:2])
+
+    def test_missing_key_is_an_error(self):
+        with self.assertRaises(ValueError):
+            rows(['{"v": 1}'], ['{"v": 1}'], key='id')
+
+    def test_repeated_keys_pair_in_order(self):
+        left = [{'id': 1, 'v': 'first'}, {'id': 1, 'v': 'second'}]
+        right = [{'id': 9}, {'id': 1, 'v': 'first'}]
+        output = rows(left, right, key='id', diff_only=True)
+        self.assertEqual(['@@ id=1 @@', '@@ id=9 @@'], [row for row in output if row.startswith('@@')])
+        self.assertIn('"second"', '\n'.join(output))
+
+    def test_unhashable_key_is_an_error(self):
+        with self.assertRaisesRegex(ValueError, 'not hashable'):
+            rows([{'id': [1]}], [{'id': [1]}], key='id')
+
+    def test_path_filter_applies_to_every_record(self):
+        left = [{'id': 1, 'at': 1}, {'id': 2, 'at': 2}]
+        right = [{'id': 1, 'at': 9}]
+        output = '\n'.join(rows(left, right, ignore_paths=['at']))
+        self.assertNotIn('"at"', output)
+        self.assertIn('"id": 2', output)
+
+    def test_invalid_line_reports_line_number(self):
+        with self.assertRaisesRegex(ValueError, 'line 2'):
+            rows(['{}', '{'], ['{}', '{}'])
+
+    def test_reads_files_and_parsed_records(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'left.ndjson')
+            with open(path, 'w', encoding='utf-8') as handle:
+                handle.write('\n'.join(LEFT))
+            output = rows(path, [json.loads(line) for line in LEFT if line], diff_only=True)
+        self.assertEqual([], output)
+
+    def test_inputs_are_streamed(self):
+        records = ({'id': n} for n in count())
+        output = list(islice(ndjson_rows(records, ({'id': n} for n in count())), 8))
+        self.assertEqual('@@ record 2 @@', output[4])
+
+    def test_parallel_rendering_keeps_order(self):
+        left = [{'id': n, 'v': n} for n in range(50)]
+        right = [{'id': n, 'v': n % 7} for n in range(50)]
+        with ThreadPoolExecutor(4) as executor:
+            parallel = rows(left, right, executor=executor, max_pending=3)
+        self.assertEqual(rows(left, right), parallel)
+
+    def test_unmatched_records_are_truncated_like_pairs(self):
+        output = rows([{'id': 1, 'v': 'a' * 60}], [], max_width=20)
+        self.assertEqual('    "v": "aaaaaaa...', output[3][:20])
+        self.assertEqual(' ', output[3][20])
+
+    def test_process_pool_shows_unmatched_records(self):
+        with ProcessPoolExecutor(2) as executor:
+            parallel = rows(LEFT, RIGHT, executor=executor, key='id')
+        self.assertEqual(rows(LEFT, RIGHT, key='id'), parallel)
+        self.assertNotIn('Unconvertable', '\n'.join(parallel))
+
+    def test_output_streams_to_sink(self):
+        sink = MemorySink()
+        jpprint_ndjson(LEFT, RIGHT, key='id', sink=sink, diff_only=True, use_colors=False)
+        self.assertEqual(3, sink.getvalue().count('@@ id='))
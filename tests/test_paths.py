@@ -0,0 +1,71 @@
+from jpprint import jpprint
+from jpprint.paths import PathFilter, parse_path
+
+from . import BaseTestCase
+
+OPTIONS = {'retr': True, 'use_box_chars': False, 'use_colors': False}
+
+
+class PathTests(BaseTestCase):
+    def test_parse_path_segments(self):
+        self.assertEqual(['a', 'b', '*', 'c'], parse_path('$.a.b[*].c'))
+        self.assertEqual(['items', '0', 'a.b'], parse_path("items[0]['a.b']"))
+        self.assertEqual(['**', 'etag'], parse_path('**.etag'))
+        self.assertEqual(['**', 'etag'], parse_path('$..etag'))
+        self.assertEqual(['a', '**', '0'], parse_path('a..[0]'))
+
+    def test_malformed_path_is_rejected(self):
+        for path in ('a[0', 'a]', 'a[]', 'a.', 'a...b', 'a[0]b'):
+            with self.subTest(path=path), self.assertRaises(ValueError):
+                parse_path(path)
+
+    def test_empty_path_is_rejected(self):
+        with self.assertRaises(ValueError):
+            PathFilter(ignore_paths=['$'])
+
+    def test_ignore_exact_path(self):
+        data = {'a': {'b': 1, 'c': 2}, 'b': 3}
+        self.assertEqual({'a': {'c': 2}, 'b': 3}, PathFilter(ignore_paths=['a.b']).apply(data))
+
+    def test_ignore_wildcard_index(self):
+        data = {'items': [{'id': 1, 'ts': 'x'}, {'id': 2, 'ts': 'y'}]}
+        self.assertEqual(
+            {'items': [{'id': 1}, {'id': 2}]}, PathFilter(ignore_paths=['items[*].ts']).apply(data)
+        )
+
+    def test_ignore_at_any_depth(self):
+        data = {'timestamp': 1, 'a': {'timestamp': 2, 'b': [{'timestamp': 3, 'c': 4}]}}
+        expected = {'a': {'b': [{'c': 4}]}}
+        self.assertEqual(expected, PathFilter(ignore_paths=['**.timestamp']).apply(data))
+
+    def test_untouched_subtrees_are_shared(self):
+        data = {'a': {'b': 1}, 'c': {'d': 2}}
+        filtered = PathFilter(ignore_paths=['c.d']).apply(data)
+        self.assertIs(data['a'], filtered['a'])
+        self.assertEqual({'a': {'b': 1}, 'c': {}}, filtered)
+
+    def test_only_keeps_matching_paths(self):
+        data = {'a': {'b': 1, 'c': 2}, 'd': 3, 'e': [{'f': 1, 'g': 2}]}
+        expected = {'a': {'b': 1}, 'e': [{'f': 1}]}
+        self.assertEqual(expected, PathFilter(only_paths=['a.b', 'e[*].f']).apply(data))
+
+    def test_only_and_ignore_combine(self):
+        data = {'a': {'b': 1, 'c': 2}, 'd': 3}
+        self.assertEqual({'a': {'c': 2}}, PathFilter(ignore_paths=['a.b'], only_paths=['a']).apply(data))
+
+    def test_only_without_matches_is_empty(self):
+        self.assertEqual({}, PathFilter(only_paths=['missing']).apply({'a': 1}))
+
+    def test_jpprint_ignores_volatile_fields(self):
+        a = {'etag': 'abc', 'name': 'x', 'meta': {'request_id': 1}}
+        b = {'etag': 'def', 'name': 'x', 'meta': {'request_id': 2}}
+        output = jpprint(a, b, ignore_paths=['etag', '**.request_id'], diff_only=True, **OPTIONS)
+        self.assertEqual([], output)
+
+    def test_jpprint_accepts_a_single_path_string(self):
+        output = jpprint({'a': 1, 'b': 2}, {'a': 1, 'b': 3}, only_paths='a', **OPTIONS)
+        self.assertEqual(jpprint({'a': 1}, {'a': 1}, **OPTIONS), output)
+
+    def test_filters_parse_json_strings(self):
+        output = jpprint('{"a": 1, "b": 2}', '{"a": 1, "b": 3}', ignore_paths=['b'], **OPTIONS)
+        self.assertEqual(jpprint({'a': 1}, {'a': 1}, **OPTIONS), output)
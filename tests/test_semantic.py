@@ -0,0 +1,77 @@
+from jpprint import DiffSession, jpprint
+from jpprint.semantic import reconcile
+
+from . import BaseTestCase
+
+OPTIONS = {'retr': True, 'use_box_chars': False, 'use_colors': False}
+
+
+class SemanticTests(BaseTestCase):
+    def test_unordered_arrays_match_regardless_of_order(self):
+        self.assertEqual([1, 2, 3], reconcile([1, 2, 3], [3, 1, 2], None, True))
+
+    def test_unordered_arrays_respect_multiplicity(self):
+        self.assertEqual([1, 1, 2], reconcile([1, 1, 2], [2, 1, 1], None, True))
+        self.assertEqual([1, 2, 1], reconcile([1, 2], [1, 1, 2], None, True))
+
+    def test_unmatched_elements_take_the_place_of_missing_ones(self):
+        self.assertEqual([1, 9, 3], reconcile([1, 2, 3], [3, 9, 1], None, True))
+
+    def test_unordered_arrays_match_nested_objects(self):
+        left = [{'id': 1, 'tags': ['a', 'b']}, {'id': 2, 'tags': []}]
+        right = [{'id': 2, 'tags': []}, {'id': 1, 'tags': ['b', 'a']}]
+        self.assertEqual(left, reconcile(left, right, None, True))
+
+    def test_float_tolerance_equalizes_close_numbers(self):
+        left = {'a': 0.1 + 0.2, 'b': [1.0, 2.0]}
+        right = {'a': 0.3, 'b': [1.0 + 1e-13, 2.5]}
+        self.assertEqual({'a': 0.1 + 0.2, 'b': [1.0, 2.5]}, reconcile(left, right, 1e-9, False))
+
+    def test_float_tolerance_with_unordered_arrays(self):
+        self.assertEqual([0.5, 1.0], reconcile([0.5, 1.0], [1.0 + 1e-12, 0.5], 1e-9, True))
+
+    def test_numbers_too_large_to_bucket_compare_exactly(self):
+        self.assertEqual([1e300, 10**400], reconcile([1e300, 10**400], [10**400, 1e300], 1e-12, True))
+        self.assertEqual(
+            [],
+            jpprint(
+                {'a': [1e300]},
+                {'a': [1e300]},
+                diff_only=True,
+                float_tolerance=1e-12,
+                unordered_arrays=True,
+                **OPTIONS,
+            ),
+        )
+
+    def test_non_positive_tolerance_is_rejected(self):
+        for tolerance in (0, -1e-9):
+            with self.subTest(tolerance=tolerance), self.assertRaises(ValueError):
+                jpprint({'a': 1}, {'a': 1}, float_tolerance=tolerance, **OPTIONS)
+
+    def test_booleans_are_not_treated_as_numbers(self):
+        self.assertEqual({'a': True}, reconcile({'a': 1}, {'a': True}, 0.5, False))
+
+    def test_ordered_arrays_are_left_alone_by_default(self):
+        self.assertEqual([3, 1, 2], reconcile([1, 2, 3], [3, 1, 2], None, False))
+
+    def test_jpprint_with_unordered_arrays_shows_no_differences(self):
+        a = {'items': [1, 2, 3], 'x': 1.0}
+        b = {'items': [3, 2, 1], 'x': 1.0 + 1e-12}
+        self.assertEqual(
+            [], jpprint(a, b, diff_only=True, float_tolerance=1e-9, unordered_arrays=True, **OPTIONS)
+        )
+
+    def test_jpprint_still_reports_real_changes(self):
+        a = {'items': [1, 2, 3]}
+        b = {'items': [3, 4, 1]}
+        output = jpprint(a, b, diff_only=True, unordered_arrays=True, **OPTIONS)
+        self.assertEqual(2, len(output))
+        self.assertIn('2,', output[0])
+        self.assertIn('4,', output[1])
+
+    def test_session_renormalizes_when_left_changes(self):
+        session = DiffSession([1, 2], [2, 1], diff_only=True, unordered_arrays=True, use_colors=False)
+        self.assertEqual([], session.rows)
+        session.update(left=[2, 1])
+        self.assertEqual([], session.rows)
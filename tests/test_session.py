@@ -0,0 +1,75 @@
+from jpprint import DiffSession, jpprint
+
+from . import BaseTestCase
+
+OPTIONS = {'use_box_chars': False, 'use_colors': False}
+
+
+class SessionTests(BaseTestCase):
+    def test_initial_rows_match_jpprint(self):
+        a = {'a': 'b', 'c': 'd'}
+        b = {'a': 'b', 'c': 'e'}
+        session = DiffSession(a, b, **OPTIONS)
+        self.assertEqual(jpprint(a, b, retr=True, **OPTIONS), session.rows)
+
+    def test_update_returns_only_changed_region(self):
+        a = {f'key{n:03}': n for n in range(100)}
+        b = dict(a)
+        session = DiffSession(a, b, **OPTIONS)
+        b['key050'] = 99
+        start, removed, changed = session.update(right=b)
+        self.assertLess(len(changed), 10)
+        self.assertTrue(any('"key050": 99' in row for row in changed))
+        self.assertEqual(jpprint(a, b, retr=True, **OPTIONS), session.rows)
+        self.assertEqual(session.rows[start : start + len(changed)], changed)
+
+    def test_patch_brings_a_copy_of_the_rows_up_to_date(self):
+        a = {f'key{n:03}': n for n in range(30)}
+        session = DiffSession(a, a, **OPTIONS)
+        displayed = session.rows
+        for b in ({**a, 'key010': 'x'}, {**a, 'key010': 'x', 'key011a': 1}, {'key000': 0}):
+            start, removed, rows = session.update(right=b)
+            displayed[start : start + removed] = rows
+            self.assertEqual(session.rows, displayed)
+
+    def test_update_with_unchanged_document_returns_nothing(self):
+        a = {'a': 'b'}
+        session = DiffSession(a, a, **OPTIONS)
+        self.assertEqual((0, 0, []), session.update(left={'a': 'b'}))
+
+    def test_update_tracks_inserted_and_removed_lines(self):
+        a = {'a': 1, 'b': 2, 'c': 3}
+        session = DiffSession(a, a, **OPTIONS)
+        session.update(right={'a': 1, 'b': 2, 'bb': 5, 'c': 3})
+        new_left = {'a': 1, 'c': 3}
+        session.update(left=new_left)
+        self.assertEqual(
+            jpprint(new_left, {'a': 1, 'b': 2, 'bb': 5, 'c': 3}, retr=True, **OPTIONS), session.rows
+        )
+
+    def test_width_change_rerenders_all_rows(self):
+        a = {'a': 'b'}
+        session = DiffSession(a, a, **OPTIONS)
+        b = {'a': 'a much longer value'}
+        self.assertEqual((0, 3, jpprint(a, b, retr=True, **OPTIONS)), session.update(right=b))
+
+    def test_update_both_sides_realigns(self):
+        session = DiffSession({'a': 1}, {'a': 2}, **OPTIONS)
+        patch = session.update(left={'x': 1}, right={'x': 1})
+        self.assertEqual((0, 3, jpprint({'x': 1}, {'x': 1}, retr=True, **OPTIONS)), patch)
+
+    def test_diff_only_updates_skip_equal_rows(self):
+        a = {'a': 1, 'b': 2}
+        session = DiffSession(a, a, diff_only=True, **OPTIONS)
+        self.assertEqual([], session.rows)
+        start, removed, changed = session.update(right={'a': 1, 'b': 3})
+        self.assertEqual((0, 0), (start, removed))
+        self.assertEqual(1, len(changed))
+
+    def test_show_ln_is_rejected(self):
+        with self.assertRaises(ValueError):
+            DiffSession({}, {}, show_ln=True)
+
+    def test_unaligned_output_is_rejected(self):
+        with self.assertRaises(ValueError):
+            DiffSession({}, {}, align_lines=False)
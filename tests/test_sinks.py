@@ -0,0 +1,83 @@
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+from jpprint import CallbackSink, FileSink, MemorySink, PagerSink, Sink, StreamSink, jpprint
+
+from . import BaseTestCase
+
+OPTIONS = {'use_box_chars': False, 'use_colors': False}
+
+
+def expected_text(a, b, **options) -> str:
+    return '\n'.join(jpprint(a, b, retr=True, **OPTIONS, **options)) + '\n'
+
+
+class SinkTests(BaseTestCase):
+    def test_memory_sink_collects_output(self):
+        sink = MemorySink()
+        jpprint({'a': 1}, {'a': 2}, sink=sink, **OPTIONS)
+        self.assertEqual(expected_text({'a': 1}, {'a': 2}), sink.getvalue())
+
+    def test_writes_are_chunked(self):
+        a = {f'key{n}': n for n in range(100)}
+        chunks = []
+        jpprint(a, a, chunk_size=256, sink=CallbackSink(chunks.append), **OPTIONS)
+        self.assertGreater(len(chunks), 5)
+        self.assertTrue(all(len(chunk) < 512 for chunk in chunks))
+        self.assertEqual(expected_text(a, a), ''.join(chunks))
+
+    def test_single_document_is_chunked(self):
+        chunks = []
+        jpprint({f'key{n}': n for n in range(100)}, chunk_size=100, sink=CallbackSink(chunks.append))
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        self.assertTrue(''.join(chunks).endswith('}\n'))
+
+    def test_file_sink_encodes_explicitly(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'diff.txt')
+            sink = FileSink(path, encoding='utf-16')
+            jpprint({'a': 'é'}, {'a': 'ü'}, chunk_size=8, sink=sink, **OPTIONS)
+            with open(path, encoding='utf-16') as handle:
+                self.assertEqual(expected_text({'a': 'é'}, {'a': 'ü'}), handle.read())
+
+    def test_stream_sink_writes_bytes_to_binary_streams(self):
+        stream = io.BytesIO()
+        jpprint({'a': 1}, {'a': 1}, sink=StreamSink(stream), **OPTIONS)
+        self.assertEqual(expected_text({'a': 1}, {'a': 1}).encode(), stream.getvalue())
+
+    def test_default_sink_follows_redirected_stdout(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            jpprint({'a': 1}, {'a': 1}, **OPTIONS)
+        self.assertEqual(expected_text({'a': 1}, {'a': 1}), out.getvalue())
+
+    def test_empty_output_still_ends_with_newline(self):
+        sink = MemorySink()
+        jpprint({'a': 1}, {'a': 1}, diff_only=True, sink=sink, **OPTIONS)
+        self.assertEqual('\n', sink.getvalue())
+
+    def test_pager_sink_pipes_to_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'paged.txt')
+            command = f'{sys.executable} -c "import sys; open(sys.argv[1], \'wb\').write(sys.stdin.buffer.read())" {path}'
+            jpprint({'a': 1}, {'a': 2}, sink=PagerSink(command), **OPTIONS)
+            with open(path, encoding='utf-8') as handle:
+                self.assertEqual(expected_text({'a': 1}, {'a': 2}), handle.read())
+
+    def test_invalid_sink_is_rejected(self):
+        with self.assertRaises(TypeError):
+            jpprint({}, {}, sink=print)
+
+    def test_sink_subclasses_must_implement_write(self):
+        class Incomplete(Sink):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_invalid_chunk_size_is_rejected(self):
+        with self.assertRaises(ValueError):
+            jpprint({}, {}, chunk_size=0, sink=MemorySink())
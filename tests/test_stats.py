@@ -0,0 +1,74 @@
+import asyncio
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+from jpprint import DiffStats, adiff, jpprint
+
+from . import BaseTestCase
+
+
+def collect_stats(*args, **options) -> tuple[list | None, DiffStats, str]:
+    collected = []
+    out = StringIO()
+    with redirect_stdout(out):
+        output = jpprint(*args, stats=collected.append, use_colors=False, **options)
+    return output, collected[0], out.getvalue()
+
+
+class StatsTests(BaseTestCase):
+    def test_output_is_unchanged_when_stats_are_collected(self):
+        a = {'a': 'b', 'c': 'd'}
+        b = {'a': 'x', 'e': 'f'}
+        output, _, _ = collect_stats(a, b, retr=True)
+        self.assertEqual(jpprint(a, b, retr=True, use_colors=False), output)
+
+    def test_reports_stage_times(self):
+        _, stats, _ = collect_stats({'a': 1, 'b': 2}, {'a': 1, 'b': 3})
+        self.assertEqual(
+            {'align', 'format', 'match', 'print', 'render', 'replace', 'width'}, set(stats.stage_seconds)
+        )
+
+    def test_reports_line_and_opcode_counts(self):
+        _, stats, _ = collect_stats({'a': 1, 'b': 2}, {'a': 1, 'b': 3, 'c': 4}, retr=True)
+        self.assertEqual(4, stats.left_lines)
+        self.assertEqual(5, stats.right_lines)
+        self.assertEqual({'equal': 2, 'replace': 1}, dict(stats.opcodes))
+        self.assertEqual([(1, 2)], stats.replace_blocks)
+        self.assertEqual(5, stats.rows)
+
+    def test_reports_bytes_printed(self):
+        _, stats, printed = collect_stats({'a': 'é'}, {'a': 'é'})
+        self.assertEqual(len(printed.encode()), stats.bytes_emitted)
+
+    def test_retr_emits_no_bytes(self):
+        _, stats, _ = collect_stats({'a': 1}, {'a': 2}, retr=True)
+        self.assertEqual(0, stats.bytes_emitted)
+        self.assertNotIn('print', stats.stage_seconds)
+
+    def test_unaligned_output_times_a_single_align_stage(self):
+        _, stats, _ = collect_stats({'a': 1}, {'a': 2}, align_lines=False, retr=True)
+        self.assertIn('align', stats.stage_seconds)
+        self.assertNotIn('match', stats.stage_seconds)
+
+    def test_identical_sides_skip_matching(self):
+        _, stats, _ = collect_stats({'a': 1}, {'a': 1}, retr=True)
+        self.assertEqual({'equal': 1}, dict(stats.opcodes))
+        self.assertEqual(3, stats.rows)
+
+    def test_nested_stage_time_is_not_counted_twice(self):
+        def slow_rows():
+            time.sleep(0.05)
+            yield 'row'
+
+        stats = DiffStats()
+        with stats.stage('outer'):
+            list(stats.timed(slow_rows(), 'inner'))
+        self.assertGreaterEqual(stats.stage_seconds['inner'], 0.05)
+        self.assertLess(stats.stage_seconds['outer'], 0.05)
+
+    def test_unsupported_paths_reject_stats(self):
+        with self.assertRaises(ValueError):
+            jpprint({'a': 1}, stats=print)
+        with self.assertRaises(ValueError):
+            asyncio.run(adiff({'a': 1}, {'a': 2}, stats=print))
@@ -0,0 +1,68 @@
+from jpprint import MemorySink, jpprint3, strip_color
+
+from . import BaseTestCase
+
+BASE = {'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5}
+
+
+def merge(base, left, right, **options) -> list[str]:
+    return [strip_color(row) for row in jpprint3(base, left, right, retr=True, **options)]
+
+
+def row_for(rows: list, key: str) -> str:
+    return next(row for row in rows if f'"{key}"' in row)
+
+
+class ThreeWayTests(BaseTestCase):
+    def test_unchanged_documents_are_all_equal(self):
+        rows = merge(BASE, BASE, BASE)
+        self.assertEqual(7, len(rows))
+        self.assertTrue(all('◆' not in row and '✖' not in row for row in rows))
+
+    def test_one_sided_changes_are_marked_on_that_side(self):
+        rows = merge(BASE, dict(BASE, b=20), dict(BASE, d=40), use_box_chars=False)
+        self.assertEqual('    "b": 20,    <>        "b": 2,    |         "b": 2, ', row_for(rows, 'b'))
+        self.assertEqual('    "d": 4,     |         "d": 4,    <>        "d": 40,', row_for(rows, 'd'))
+
+    def test_identical_changes_on_both_sides_do_not_conflict(self):
+        rows = merge(BASE, dict(BASE, c=9), dict(BASE, c=9))
+        self.assertEqual(2, row_for(rows, 'c').count('◆'))
+        self.assertNotIn('✖', ''.join(rows))
+
+    def test_diverging_changes_are_conflicts(self):
+        rows = merge(BASE, dict(BASE, c=9), dict(BASE, c=8), use_box_chars=False)
+        self.assertEqual('    "c": 9,    !!        "c": 3,    !!        "c": 8,', row_for(rows, 'c'))
+
+    def test_diff_only_keeps_changed_rows(self):
+        rows = merge(BASE, dict(BASE, c=9), dict(BASE, c=8), diff_only=True)
+        self.assertEqual(1, len(rows))
+
+    def test_added_and_deleted_lines_align_against_base(self):
+        left = {key: value for key, value in BASE.items() if key != 'c'}
+        rows = merge(BASE, left, dict(BASE, f=6), use_box_chars=False)
+        self.assertTrue(row_for(rows, 'c').lstrip().startswith('<>'))
+        self.assertIn('"f": 6', rows[-2])
+
+    def test_unaligned_mode_zips_lines(self):
+        rows = merge(BASE, dict(BASE, c=9), dict(BASE, c=8), align_lines=False)
+        self.assertEqual(7, len(rows))
+        self.assertIn('✖', row_for(rows, 'c'))
+
+    def test_conflicts_are_colored(self):
+        rows = jpprint3(BASE, dict(BASE, c=9), dict(BASE, c=8), retr=True)
+        self.assertIn('\033[95m', next(row for row in rows if '"c"' in row))
+
+    def test_output_streams_to_sink(self):
+        sink = MemorySink()
+        jpprint3(BASE, BASE, dict(BASE, e=6), sink=sink, use_colors=False)
+        self.assertEqual(7, sink.getvalue().count('\n'))
+
+    def test_tolerated_differences_are_not_changes(self):
+        rows = merge({'x': 1.0}, {'x': 1.0001}, {'x': 0.9999}, float_tolerance=0.001)
+        self.assertNotIn('◆', ''.join(rows))
+
+    def test_unsupported_options_are_rejected(self):
+        with self.assertRaises(ValueError):
+            jpprint3(BASE, BASE, BASE, collapse_equal_subtrees=True)
+        with self.assertRaises(ValueError):
+            jpprint3(BASE, BASE, BASE, max_depth=0)
@@ -0,0 +1,40 @@
+from jpprint import jpprint
+from jpprint.formatter import max_len, truncate
+from jpprint.width import clip, pad, text_width
+
+from . import BaseTestCase
+
+
+class WidthTests(BaseTestCase):
+    def test_wide_and_zero_width_characters(self):
+        self.assertEqual(2, text_width('ab'))
+        self.assertEqual(4, text_width('山田'))
+        self.assertEqual(2, text_width('😀'))
+        self.assertEqual(1, text_width('e\u0301'))
+
+    def test_padding_uses_display_width(self):
+        self.assertEqual('山田  ', pad('山田', 6))
+        self.assertEqual('ab    ', pad('ab', 6))
+
+    def test_clip_never_splits_wide_characters(self):
+        self.assertEqual('山', clip('山田', 3))
+        self.assertEqual('abc', clip('abcdef', 3))
+
+    def test_document_width_and_truncation(self):
+        self.assertEqual(8, max_len('ab\n山田太郎'))
+        self.assertEqual('山...\nab', truncate('山田太郎\nab', 6))
+
+    def test_columns_align_with_wide_text(self):
+        rows = jpprint(
+            {'k': '山田太郎', 'x': 1},
+            {'k': 'yamada', 'x': 1},
+            ensure_ascii=False,
+            retr=True,
+            use_colors=False,
+        )
+        delimiters = {text_width(row.split('│')[0].split('◆')[0]) for row in rows}
+        self.assertEqual(1, len(delimiters))
+
+    def test_ascii_escaping_is_the_default(self):
+        rows = jpprint({'k': '山'}, {'k': '田'}, retr=True, use_colors=False)
+        self.assertIn('\\u5c71', rows[1])
@@ -0,0 +1,84 @@
+from jpprint import DiffSession, html_diff, jpprint, jpprint3, ndjson_rows
+from jpprint.width import split_width, text_width
+
+from . import BaseTestCase
+
+LEFT = {'blob': 'x' * 70, 'id': 1}
+RIGHT = {'blob': 'x' * 40 + 'y' * 30, 'id': 1}
+
+
+def wrapped(*args, **options) -> list[str]:
+    return jpprint(*args, retr=True, use_colors=False, wrap=True, **options)
+
+
+class WrapTests(BaseTestCase):
+    def test_long_lines_become_continuation_rows(self):
+        rows = wrapped(LEFT, RIGHT, max_width=30)
+        self.assertEqual(6, len(rows))
+        self.assertTrue(all(row.count('◆') == 1 for row in rows[1:4]))
+        self.assertIn('yyy', rows[2])
+
+    def test_columns_are_capped_at_max_width(self):
+        rows = wrapped(LEFT, RIGHT, max_width=30)
+        self.assertEqual({70}, {text_width(row) for row in rows})
+
+    def test_nothing_is_truncated(self):
+        text = ''.join(row[:30] for row in wrapped(LEFT, LEFT, max_width=30))
+        self.assertEqual(70, text.count('x'))
+        self.assertNotIn('...', text)
+
+    def test_continuation_rows_blank_the_line_number(self):
+        rows = wrapped(LEFT, RIGHT, max_width=30, show_ln=True)
+        self.assertEqual(['1', '2', ' ', ' ', '3', '4'], [row[0] for row in rows])
+
+    def test_wide_characters_wrap_by_display_width(self):
+        self.assertEqual(['山山', '山'], split_width('山山山', 4))
+        self.assertEqual(['ab', 'c'], split_width('abc', 2))
+        self.assertEqual([''], split_width('', 5))
+
+    def test_diff_only_applies_to_logical_rows(self):
+        rows = wrapped(LEFT, RIGHT, max_width=30, diff_only=True)
+        self.assertEqual(3, len(rows))
+
+    def test_output_is_capped_in_bytes(self):
+        rows = jpprint(LEFT, RIGHT, retr=True, use_colors=False, wrap=True, max_width=30, max_bytes=150)
+        self.assertEqual(3, len(rows))
+        self.assertEqual('... output truncated at 150 bytes', rows[-1])
+
+    def test_stats_path_wraps_and_caps(self):
+        captured = []
+        rows = jpprint(
+            LEFT,
+            RIGHT,
+            retr=True,
+            stats=captured.append,
+            use_colors=False,
+            wrap=True,
+            max_width=30,
+            max_bytes=150,
+        )
+        self.assertEqual(3, len(rows))
+        self.assertEqual(3, captured[0].rows)
+
+    def test_ndjson_rows_wrap_and_cap(self):
+        rows = list(ndjson_rows([LEFT] * 3, [RIGHT] * 3, wrap=True, max_width=30, max_bytes=400))
+        self.assertEqual('@@ record 1 @@', rows[0])
+        self.assertTrue(rows[-1].startswith('... output truncated'))
+        one_sided = list(ndjson_rows([{'a': 1}], [], wrap=True, use_colors=False))
+        self.assertEqual(
+            ['@@ record 1 @@', '{', '"a": 1', '}'], [row.split('◆')[0].strip() for row in one_sided]
+        )
+
+    def test_unsupported_renderers_reject_wrap(self):
+        with self.assertRaises(ValueError):
+            DiffSession(LEFT, RIGHT, wrap=True)
+        with self.assertRaises(ValueError):
+            jpprint3(LEFT, LEFT, RIGHT, wrap=True)
+
+    def test_byte_cap_is_honoured_or_rejected(self):
+        rows = jpprint3(LEFT, LEFT, RIGHT, retr=True, use_colors=False, max_bytes=150)
+        self.assertEqual('... output truncated at 150 bytes', rows[-1])
+        with self.assertRaises(ValueError):
+            DiffSession(LEFT, RIGHT, max_bytes=150)
+        with self.assertRaises(ValueError):
+            list(html_diff(LEFT, RIGHT, max_bytes=150))